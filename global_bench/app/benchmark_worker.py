@@ -0,0 +1,59 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import List
+from uuid import UUID
+
+from fastapi import FastAPI
+
+from app.cache import leaderboard_cache
+from domain.services.benchmark_service import BenchmarkService
+from infrastructure.database import SessionLocal
+from infrastructure.adapters.repository.postgres_repository import PostgresRepository
+
+logger = logging.getLogger(__name__)
+
+# Lu une fois à l'import (après load_dotenv) plutôt qu'à chaque service construit
+BENCHMARK_MAX_IN_FLIGHT = int(os.getenv("BENCHMARK_MAX_IN_FLIGHT", "8"))
+
+
+@dataclass(frozen=True)
+class BenchmarkJob:
+    team_id: UUID
+    model_name: str
+    categories: List[str]
+    session_id: UUID
+
+
+async def benchmark_worker(app: FastAPI) -> None:
+    """
+    Consomme app.state.benchmark_queue : un benchmark à la fois par worker,
+    hors du cycle requête/réponse HTTP.
+    """
+    queue: asyncio.Queue = app.state.benchmark_queue
+    while True:
+        job: BenchmarkJob = await queue.get()
+        # Session DB propre au job : celle de la requête est fermée depuis longtemps
+        db = SessionLocal()
+        try:
+            service = BenchmarkService(
+                repository=PostgresRepository(db),
+                cloud=app.state.cloud_adapter,
+                llm=app.state.llm_adapter,
+                notifier=app.state.notifier,
+                on_result_saved=leaderboard_cache.invalidate,
+                max_in_flight=BENCHMARK_MAX_IN_FLIGHT,
+                instance_pool=app.state.instance_pool,
+            )
+            await service.run_full_benchmark(
+                job.team_id,
+                job.model_name,
+                job.categories,
+                session_id=job.session_id,
+            )
+        except Exception:
+            logger.exception("Benchmark job failed (session %s)", job.session_id)
+        finally:
+            db.close()
+            queue.task_done()
@@ -0,0 +1,91 @@
+import asyncio
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import orjson
+from cachetools import TTLCache
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+
+class ReadCache:
+    """
+    Cache mémoire à TTL pour les endpoints de lecture très sollicités
+    (leaderboard, datasets, hackathons).
+    Un seul chargement par clé à la fois : les requêtes concurrentes attendent
+    le résultat au lieu de toutes taper Postgres.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        value, _ = await self.lookup(key, loader)
+        return value
+
+    async def lookup(self, key: Hashable, loader: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Comme get_or_load, mais indique aussi si la valeur venait du cache."""
+        try:
+            return self._cache[key], True
+        except KeyError:
+            pass
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            try:
+                return self._cache[key], True
+            except KeyError:
+                pass
+            # Le loader est synchrone (SQLAlchemy) : on le sort de l'event loop.
+            value = await run_in_threadpool(loader)
+            self._cache[key] = value
+            return value, False
+
+    def invalidate(self, key: Hashable = None) -> None:
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+
+@dataclass(frozen=True)
+class CachedJSON:
+    body: bytes
+    etag: str
+
+
+def encode_json(data: Any) -> CachedJSON:
+    body = orjson.dumps(data, option=orjson.OPT_SERIALIZE_UUID)
+    return CachedJSON(body=body, etag='"%s"' % hashlib.blake2b(body, digest_size=12).hexdigest())
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {c.strip().removeprefix("W/") for c in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+async def cached_json_response(
+    request: Request, cache: ReadCache, key: Hashable, loader: Callable[[], Any]
+) -> Response:
+    """
+    Réponse JSON servie depuis le cache : corps déjà encodé + ETag calculé une
+    seule fois par entrée. 304 si le client a déjà cette version.
+    """
+    entry, hit = await cache.lookup(key, lambda: encode_json(loader()))
+    headers = {"ETag": entry.etag, "X-Cache": "HIT" if hit else "MISS"}
+    if _etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+# Invalidé à chaque flush de TaskResult (BenchmarkService.on_result_saved) :
+# le TTL ne sert que de filet pour les écritures faites par un autre process.
+leaderboard_cache = ReadCache(ttl=float(os.getenv("LEADERBOARD_CACHE_TTL", "60")))
+datasets_cache = ReadCache(ttl=30)
+hackathons_cache = ReadCache(ttl=30)
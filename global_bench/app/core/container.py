@@ -18,7 +18,12 @@ class Container:
         self.exec_service = ExecutionService(datasets_root=settings.datasets_root)
         self.enrich_service = BenchmarkEnrichmentService(self.exec_service)
 
-        self.repo = BenchmarkRepositoryPG(settings.pg_dsn)
+        # Un seul pool de connexions pour tout le process (get_container est en cache)
+        self.repo = BenchmarkRepositoryPG(
+            settings.pg_dsn,
+            min_size=settings.pg_pool_min,
+            max_size=settings.pg_pool_max,
+        )
 
         self.global_stream = GlobalBenchmarkStreamService(
             GlobalStreamDeps(
@@ -8,7 +8,15 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
     pg_dsn:str = os.getenv("PG_DSN") or os.getenv("DATABASE_URL") or ""
+    pg_pool_min: int = 2
+    pg_pool_max: int = 16
     datasets_root: str = "datasets/test_database"
     worker_base_url: str = os.getenv("WORKER_BASE_URL") or "http://localhost:8001"
 
+    # Instances de workers gardées chaudes entre deux benchmarks (InstancePool) ;
+    # min > 0 garde des instances payantes allumées en permanence
+    instance_pool_min: int = 0
+    instance_pool_max: int = 4
+    instance_pool_idle_ttl: float = 300.0
+
     dtype: str = "auto"
@@ -1,41 +1,132 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
+from typing import Annotated
 
-from fastapi import Depends
+import anyio.to_thread
+import httpx
+from fastapi import Depends, FastAPI, Request
 from sqlalchemy.orm import Session
 
+from app.benchmark_worker import BENCHMARK_MAX_IN_FLIGHT, benchmark_worker
+from app.cache import leaderboard_cache
+from app.core.deps import get_settings
 from infrastructure.database import get_db
 from infrastructure.adapters.repository.postgres_repository import PostgresRepository
-from infrastructure.adapters.cloud.runpod_adapter import RunPodAdapter
-from infrastructure.adapters.cloud.local_cloud_adapter import LocalCloudAdapter
-from infrastructure.adapters.llm.openai_adapter import OpenAIAdapter
 from infrastructure.adapters.notifier.websocket_notifier import ConnectionManager, WebSocketNotifier
+from infrastructure.executor.backends.postgres_executor import PostgresExecutor
 
 from domain.services.benchmark_service import BenchmarkService
 from domain.services.dataset_service import DatasetService
 from domain.services.team_service import TeamService
 from domain.services.participant_service import ParticipantService
 from domain.services.hackathon_service import HackathonService
+from domain.services.instance_pool import InstancePool
 
 
 ws_manager = ConnectionManager()
 
 
-def get_repository(db: Session = Depends(get_db)) -> PostgresRepository:
-    return PostgresRepository(db)
+def build_http_client() -> httpx.AsyncClient:
+    # Un seul pool de connexions keep-alive (HTTP/2 quand le serveur le
+    # supporte) partagé par les adapters LLM et cloud.
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=60.0,
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "64")),
+            max_keepalive_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "64")),
+        ),
+    )
 
 
-def get_cloud_adapter():
+def build_cloud_adapter(http: httpx.AsyncClient):
+    # Imports locaux : le SDK runpod (~2s) et docker ne sont chargés que pour
+    # l'adapter réellement utilisé, pas au démarrage du module.
     env = os.getenv("APP_ENV", "local")
     if env == "production":
+        from infrastructure.adapters.cloud.runpod_adapter import RunPodAdapter
+
         return RunPodAdapter(
             api_key=os.getenv("RUNPOD_API_KEY", "none"),
             worker_image=os.getenv("WORKER_IMAGE_URL", "none"),
+            http=http,
         )
-    return LocalCloudAdapter(image_name="benchmark-worker-local")
+    from infrastructure.adapters.cloud.local_cloud_adapter import LocalCloudAdapter
+
+    return LocalCloudAdapter(image_name="benchmark-worker-local", http=http)
+
+
+def build_llm_adapter(http: httpx.AsyncClient):
+    from infrastructure.adapters.llm.openai_adapter import OpenAIAdapter
+
+    return OpenAIAdapter(api_key=os.getenv("OPENAI_API_KEY", "none"), client=http)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Les routes `def` et les appels SQLAlchemy synchrones passent par le
+    # threadpool AnyIO (40 threads par défaut) : on l'agrandit.
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = int(os.getenv("THREADPOOL_SIZE", "100"))
+
+    # Adapters are built once per lifespan (not per request) and share one
+    # HTTP client, closed on shutdown.
+    app.state.http_client = build_http_client()
+    app.state.cloud_adapter = build_cloud_adapter(app.state.http_client)
+    app.state.llm_adapter = build_llm_adapter(app.state.http_client)
+    app.state.notifier = WebSocketNotifier(ws_manager)
+
+    # Instances de workers gardées chaudes entre deux benchmarks. Le conteneur
+    # local écoute sur un port fixe : une seule instance possible en local.
+    settings = get_settings()
+    pool_max = settings.instance_pool_max if os.getenv("APP_ENV", "local") == "production" else 1
+    app.state.instance_pool = InstancePool(
+        app.state.cloud_adapter,
+        min_size=min(settings.instance_pool_min, pool_max),
+        max_size=pool_max,
+        idle_ttl=settings.instance_pool_idle_ttl,
+    )
+    await app.state.instance_pool.start()
+
+    # Les benchmarks complets (LLM + provisioning cloud) tournent dans des
+    # workers dédiés plutôt qu'en BackgroundTasks.
+    app.state.benchmark_queue = asyncio.Queue()
+    workers = [
+        asyncio.create_task(benchmark_worker(app))
+        for _ in range(int(os.getenv("BENCHMARK_WORKERS", "2")))
+    ]
+    try:
+        yield
+    finally:
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        await app.state.instance_pool.close()
+        await app.state.notifier.flush()
+        await app.state.http_client.aclose()
+        # Pools psycopg2 de l'executor postgres (partagés par le process)
+        await asyncio.to_thread(PostgresExecutor.close_pools)
+
+
+def get_repository(db: Session = Depends(get_db)) -> PostgresRepository:
+    return PostgresRepository(db)
+
+
+def get_cloud_adapter(request: Request):
+    return request.app.state.cloud_adapter
+
+
+def get_llm_adapter(request: Request):
+    return request.app.state.llm_adapter
+
+
+def get_notifier(request: Request) -> WebSocketNotifier:
+    return request.app.state.notifier
 
 
-def get_llm_adapter():
-    return OpenAIAdapter(api_key=os.getenv("OPENAI_API_KEY", "none"))
+def get_benchmark_queue(request: Request) -> asyncio.Queue:
+    return request.app.state.benchmark_queue
 
 
 def get_dataset_service(repo: PostgresRepository = Depends(get_repository)) -> DatasetService:
@@ -57,6 +148,21 @@ def get_benchmark_service(
     repo: PostgresRepository = Depends(get_repository),
     cloud=Depends(get_cloud_adapter),
     llm=Depends(get_llm_adapter),
+    notifier: WebSocketNotifier = Depends(get_notifier),
 ) -> BenchmarkService:
-    notifier = WebSocketNotifier(ws_manager)
-    return BenchmarkService(repository=repo, cloud=cloud, llm=llm, notifier=notifier)
+    return BenchmarkService(
+        repository=repo,
+        cloud=cloud,
+        llm=llm,
+        notifier=notifier,
+        on_result_saved=leaderboard_cache.invalidate,
+        max_in_flight=BENCHMARK_MAX_IN_FLIGHT,
+    )
+
+
+# Alias partagés par toutes les routes : `service: TeamServiceDep`
+DatasetServiceDep = Annotated[DatasetService, Depends(get_dataset_service)]
+TeamServiceDep = Annotated[TeamService, Depends(get_team_service)]
+ParticipantServiceDep = Annotated[ParticipantService, Depends(get_participant_service)]
+HackathonServiceDep = Annotated[HackathonService, Depends(get_hackathon_service)]
+BenchmarkServiceDep = Annotated[BenchmarkService, Depends(get_benchmark_service)]
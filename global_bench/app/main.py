@@ -1,5 +1,12 @@
+from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+
+# .env doit être chargé avant d'importer les routers : infrastructure.database
+# lit DATABASE_URL à l'import.
+load_dotenv()
 
 from app.routes.ws import router as ws_router
 from app.routes.datasets import router as datasets_router
@@ -9,24 +16,51 @@ from app.routes.teams import router as teams_router
 from app.routes.participants import router as participants_router
 from app.routes.hackathons import router as hackathon_router
 from app.routes.bench_routes import router as sse_bench_router
+from app.deps import lifespan
 
-from dotenv import load_dotenv
-load_dotenv()
 
-app = FastAPI(title="Hackathon Benchmark Platform")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"], # Allow everything for now
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.include_router(sse_bench_router, tags=["SSE ROUTER"])
-app.include_router(ws_router)
-app.include_router(datasets_router)
-app.include_router(benchmarks_router)
-app.include_router(hackathon_router)
-app.include_router(results_router)
-app.include_router(teams_router)
-app.include_router(participants_router)
\ No newline at end of file
+def create_app() -> FastAPI:
+    app = FastAPI(
+        title="Hackathon Benchmark Platform",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"], # Allow everything for now
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    # Leaderboard / datasets en JSON : gros gain en bande passante.
+    # Les websockets et le flux SSE (text/event-stream) ne sont pas compressés.
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+    app.include_router(sse_bench_router, tags=["SSE ROUTER"])
+    app.include_router(ws_router)
+    app.include_router(datasets_router)
+    app.include_router(benchmarks_router)
+    app.include_router(hackathon_router)
+    app.include_router(results_router)
+    app.include_router(teams_router)
+    app.include_router(participants_router)
+
+    return app
+
+
+app = create_app()
+
+
+if __name__ == "__main__":
+    import os
+
+    import uvicorn
+
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
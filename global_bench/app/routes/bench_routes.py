@@ -12,10 +12,13 @@ from app.core.deps import get_container
 router = APIRouter()
 
 
+_HF_URL_PREFIX = "https://huggingface.co/"
+
+
 def parse_hf_input(model: str, revision: Optional[str]) -> tuple[str, str]:
     m = model.strip()
-    if m.startswith("https://huggingface.co/"):
-        m = m.replace("https://huggingface.co/", "", 1).strip("/")
+    if m.startswith(_HF_URL_PREFIX):
+        m = m.removeprefix(_HF_URL_PREFIX).strip("/")
     rev = (revision or "main").strip()
     return m, rev
 
@@ -44,8 +47,8 @@ async def complete_benchmark_stream(
 ):
     model_id, revision = parse_hf_input(req.model, req.revision)
 
+    # db_id est passé à part : params ne contient que les réglages du run
     params = {
-        "db_id": req.db_id,
         "limit": req.limit,
         "offset": req.offset,
         "max_new_tokens": req.max_new_tokens,
@@ -55,18 +58,15 @@ async def complete_benchmark_stream(
         "dtype": req.dtype,
     }
 
-    async def stream():
-        async for chunk in container.global_stream.stream(
+    # Le générateur du service est servi tel quel, sans générateur intermédiaire
+    return StreamingResponse(
+        container.global_stream.stream(
             model_id=model_id,
             revision=revision,
             db_id=req.db_id,
-            params={k: v for k, v in params.items() if k != "db_id"},
+            params=params,
             request=request,
-        ):
-            yield chunk
-
-    return StreamingResponse(
-        stream(),
+        ),
         media_type="text/event-stream",
         headers={"Cache-Control": "no-cache", "Connection": "keep-alive", "X-Accel-Buffering": "no"},
     )
@@ -1,10 +1,12 @@
+import asyncio
 from uuid import UUID
 from typing import List
 
-from fastapi import APIRouter, Depends, BackgroundTasks
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
 
-from domain.services.benchmark_service import BenchmarkService
-from app.deps import get_benchmark_service
+from app.benchmark_worker import BenchmarkJob
+from app.deps import BenchmarkServiceDep, get_benchmark_queue
 
 router = APIRouter(prefix="/benchmarks", tags=["Execution"])
 
@@ -14,16 +16,18 @@ async def run_evaluation(
     team_id: UUID,
     model_name: str,
     categories: List[str],
-    background_tasks: BackgroundTasks,
-    service: BenchmarkService = Depends(get_benchmark_service),
+    service: BenchmarkServiceDep,
+    queue: asyncio.Queue = Depends(get_benchmark_queue),
 ):
-    session_id = service.init_session(team_id, model_name)
+    session_id = await run_in_threadpool(service.init_session, team_id, model_name)
 
-    background_tasks.add_task(
-        service.run_full_benchmark,
-        team_id,
-        model_name,
-        categories,
+    await queue.put(
+        BenchmarkJob(
+            team_id=team_id,
+            model_name=model_name,
+            categories=categories,
+            session_id=session_id,
+        )
     )
 
     return {
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 
-from domain.services.dataset_service import DatasetService
-from app.deps import get_dataset_service
+from app.deps import DatasetServiceDep
+from app.cache import datasets_cache
 
 router = APIRouter(prefix="/datasets", tags=["Admin"])
 
@@ -10,12 +11,14 @@ router = APIRouter(prefix="/datasets", tags=["Admin"])
 async def register_dataset(
     name: str,
     path: str,
-    service: DatasetService = Depends(get_dataset_service),
+    service: DatasetServiceDep,
 ):
-    dataset = service.register_dataset(name, path)
+    # Lecture du fichier + écriture DB synchrones : hors de l'event loop
+    dataset = await run_in_threadpool(service.register_dataset, name, path)
+    datasets_cache.invalidate()
     return {"status": "success", "dataset": dataset}
 
 
 @router.get("")
-async def list_datasets(service: DatasetService = Depends(get_dataset_service)):
-    return service.list_datasets()
+async def list_datasets(service: DatasetServiceDep):
+    return await datasets_cache.get_or_load("all", service.list_datasets)
@@ -4,12 +4,12 @@ from datetime import datetime
 from typing import Optional, List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
-from domain.services.hackathon_service import HackathonService
 from domain.exceptions import HackathonNotFound, HackathonAlreadyExists, HackathonInvalidDates
-from app.deps import get_hackathon_service  # <-- add this
+from app.deps import HackathonServiceDep  # <-- add this
+from app.cache import cached_json_response, hackathons_cache
 
 router = APIRouter(prefix="/hackathons", tags=["hackathons"])
 
@@ -28,32 +28,35 @@ class HackathonOut(BaseModel):
 @router.post("/", response_model=HackathonOut, status_code=201)
 def create_hackathon(
     payload: HackathonCreateIn,
-    service: HackathonService = Depends(get_hackathon_service),
+    service: HackathonServiceDep,
 ):
     try:
         h = service.create_hackathon(payload.name, payload.start_date, payload.end_date)
-        return HackathonOut(**h.__dict__)
+        hackathons_cache.invalidate()
+        return HackathonOut.model_construct(**h.__dict__)
     except HackathonInvalidDates as e:
         raise HTTPException(status_code=400, detail=str(e))
     except HackathonAlreadyExists as e:
         raise HTTPException(status_code=409, detail=str(e))
 
 @router.get("/", response_model=List[HackathonOut])
-def list_hackathons(service: HackathonService = Depends(get_hackathon_service)):
-    hs = service.list_hackathons()
-    return [HackathonOut(**h.__dict__) for h in hs]
+async def list_hackathons(request: Request, service: HackathonServiceDep):
+    # Les dataclasses Hackathon ont les mêmes champs que HackathonOut : orjson
+    # les encode directement, avec ETag / 304.
+    return await cached_json_response(request, hackathons_cache, "all", service.list_hackathons)
 
 @router.get("/{hackathon_id}", response_model=HackathonOut)
-def get_hackathon(hackathon_id: UUID, service: HackathonService = Depends(get_hackathon_service)):
+def get_hackathon(hackathon_id: UUID, service: HackathonServiceDep):
     try:
         h = service.get_hackathon(hackathon_id)
-        return HackathonOut(**h.__dict__)
+        return HackathonOut.model_construct(**h.__dict__)
     except HackathonNotFound as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 @router.delete("/{hackathon_id}", status_code=204)
-def delete_hackathon(hackathon_id: UUID, service: HackathonService = Depends(get_hackathon_service)):
+def delete_hackathon(hackathon_id: UUID, service: HackathonServiceDep):
     try:
         service.delete_hackathon(hackathon_id)
+        hackathons_cache.invalidate()
     except HackathonNotFound as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -3,11 +3,10 @@ from __future__ import annotations
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter
 from pydantic import BaseModel, EmailStr
 
-from app.deps import get_participant_service
-from domain.services.participant_service import ParticipantService
+from app.deps import ParticipantServiceDep
 
 router = APIRouter(prefix="/participants", tags=["participants"])
 
@@ -21,7 +20,7 @@ class ParticipantCreateIn(BaseModel):
 @router.post("/", status_code=201)
 def create_participant(
     payload: ParticipantCreateIn,
-    service: ParticipantService = Depends(get_participant_service),
+    service: ParticipantServiceDep,
 ):
     return service.create_participant(
         first_name=payload.first_name,
@@ -31,14 +30,14 @@ def create_participant(
 
 
 @router.get("/")
-def list_participants(service: ParticipantService = Depends(get_participant_service)):
+def list_participants(service: ParticipantServiceDep):
     return service.list_participants()
 
 
 @router.get("/{participant_id}")
 def get_participant(
     participant_id: UUID,
-    service: ParticipantService = Depends(get_participant_service),
+    service: ParticipantServiceDep,
 ):
     return service.get_participant(participant_id)
 
@@ -46,7 +45,7 @@ def get_participant(
 @router.delete("/{participant_id}", status_code=204)
 def delete_participant(
     participant_id: UUID,
-    service: ParticipantService = Depends(get_participant_service),
+    service: ParticipantServiceDep,
 ):
     service.delete_participant(participant_id)
     return None
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Request
 
-from domain.services.benchmark_service import BenchmarkService
-from app.deps import get_benchmark_service
+from app.deps import BenchmarkServiceDep
+from app.cache import cached_json_response, leaderboard_cache
 
 router = APIRouter(tags=["Results"])
 
 
 @router.get("/leaderboard")
-async def get_leaderboard(service: BenchmarkService = Depends(get_benchmark_service)):
-    return service.get_leaderboard()
+async def get_leaderboard(request: Request, service: BenchmarkServiceDep):
+    # Rows are plain dicts built by the service: encoded once with orjson and
+    # kept (with their ETag) in the TTL cache until the next saved result.
+    return await cached_json_response(request, leaderboard_cache, "leaderboard", service.get_leaderboard)
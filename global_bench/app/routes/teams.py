@@ -1,8 +1,8 @@
+from typing import List
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, EmailStr
-from app.deps import get_team_service
-from domain.services.team_service import TeamService
+from app.deps import TeamServiceDep
 from domain.models.identity import Participant
 from domain.exceptions import TeamNotFound, ParticipantNotFound
 
@@ -15,7 +15,7 @@ class TeamCreateIn(BaseModel):
 @router.post("/", status_code=201)
 def create_team(
     payload: TeamCreateIn,
-    service: TeamService = Depends(get_team_service),
+    service: TeamServiceDep,
 ):
     return service.create_team(
         name=payload.name,
@@ -25,21 +25,21 @@ def create_team(
 @router.get("/hackathon/{hackathon_id}")
 def list_teams_by_hackathon(
     hackathon_id: UUID,
-    service:TeamService = Depends(get_team_service),
+    service: TeamServiceDep,
 ):
     return service.list_teams(hackathon_id)
 
 @router.get("/{team_id}")
 def get_team(
     team_id: UUID,
-    service:TeamService = Depends(get_team_service),
+    service: TeamServiceDep,
 ):
     return service.get_team(team_id)
 
 @router.delete("/{team_id}", status_code=204)
 def delete_team(
     team_id: UUID,
-    service: TeamService = Depends(get_team_service),
+    service: TeamServiceDep,
 ):
     service.delete_team(team_id)
     return None
@@ -53,16 +53,30 @@ class TeamAddParticipantIn(BaseModel):
 def add_participant_to_team(
     team_id: UUID,
     payload: TeamAddParticipantIn,
-    service: TeamService = Depends(get_team_service),
+    service: TeamServiceDep,
 ):
     service.add_participant_to_team(team_id, payload.participant_id)
     return None
 
+
+class TeamAddParticipantsIn(BaseModel):
+    participant_ids: List[UUID]
+
+
+@router.post("/{team_id}/participants/bulk", status_code=204)
+def add_participants_to_team(
+    team_id: UUID,
+    payload: TeamAddParticipantsIn,
+    service: TeamServiceDep,
+):
+    service.add_participants_to_team(team_id, payload.participant_ids)
+    return None
+
 @router.delete("/{team_id}/participants/{participant_id}", status_code=204)
 def remove_participant_from_team(
     team_id: UUID,
     participant_id: UUID,
-    service: TeamService = Depends(get_team_service),
+    service: TeamServiceDep,
 ):
     try:
         service.remove_participant_from_team(team_id, participant_id)
@@ -1,16 +1,19 @@
 from typing import Optional, List
 from dataclasses import dataclass, field
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
 
-@dataclass(frozen=True)
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+@dataclass(frozen=True, slots=True)
 class ExecutionMetrics:
     cpu_usage_percent: float
     ram_usage_mb: float
     duration_ms: float
     error_msg: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class TaskResult:
     id: UUID
     evaluation_id: UUID
@@ -20,9 +23,9 @@ class TaskResult:
     silver_score: float
     generation_duration: float
     metrics: ExecutionMetrics
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at: datetime = field(default_factory=utcnow)
 
-@dataclass
+@dataclass(slots=True)
 class EvaluationSession:
     id: UUID
     team_id: UUID
@@ -31,4 +34,4 @@ class EvaluationSession:
     model_name: str
     status: str              # 'pending', 'running', 'completed', 'failed'
     results: List[TaskResult] = field(default_factory=list)
-    created_at: datetime = field(default_factory=datetime.now)
\ No newline at end of file
+    created_at: datetime = field(default_factory=utcnow)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import uuid
 
 
@@ -27,3 +27,20 @@ class BenchmarkRepositoryPort(ABC):
     @abstractmethod
     def insert_item(self, run_id: uuid.UUID, item: Dict[str, Any]) -> None:
         raise NotImplementedError
+
+    @abstractmethod
+    def log_events_bulk(self, run_id: uuid.UUID, events: List[Tuple[str, Dict[str, Any]]]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def insert_items_bulk(self, run_id: uuid.UUID, items: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def write_batch(
+        self,
+        run_id: uuid.UUID,
+        events: List[Tuple[str, Dict[str, Any]]],
+        items: List[Dict[str, Any]],
+    ) -> None:
+        raise NotImplementedError
@@ -3,7 +3,7 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     success: bool
     output: Any
@@ -48,6 +48,10 @@ class RepositoryPort(ABC):
     def save_task_result(self, result: TaskResult) -> None:
         pass
 
+    @abstractmethod
+    def save_task_results_bulk(self, results: List[TaskResult]) -> None:
+        """Insère plusieurs résultats en un seul aller-retour DB."""
+
     @abstractmethod
     def get_session_by_id(self, session_db_id: UUID) -> Optional[EvaluationSession]:
         pass
@@ -84,6 +88,10 @@ class RepositoryPort(ABC):
     def add_participant_to_team(self, team_id: UUID, participant_id: UUID) -> None:
         pass
 
+    @abstractmethod
+    def add_participants_to_team(self, team_id: UUID, participant_ids: List[UUID]) -> None:
+        pass
+
     @abstractmethod
     def remove_participant_from_team(self, team_id: UUID, participant_id: UUID) -> None:
         pass
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import time
 from dataclasses import dataclass
 from typing import Any, Optional
 
+from domain.ports.executor import ExecutionResult
 from domain.services.execution_service import ExecutionService
 
 
-@dataclass(frozen=True)
+def _length_prefixed(data: bytes) -> bytes:
+    return len(data).to_bytes(8, "little") + data
+
+
+@dataclass(frozen=True, slots=True)
 class ScoredResult:
     pred_exec_success: bool
     gold_exec_success: bool
@@ -26,13 +33,22 @@ class BenchmarkEnrichmentService:
     def __init__(self, exec_service: ExecutionService):
         self.exec_service = exec_service
 
-    def _normalize_rows(self, rows: Any) -> list[tuple[str, ...]]:
-        if rows is None:
-            return []
-        out: list[tuple[str, ...]] = []
-        for r in rows:
-            out.append(tuple("NULL" if x is None else str(x) for x in r))
-        return out
+    def _row_multiset_digest(self, rows: Any) -> bytes:
+        """
+        Empreinte du multiset des lignes (ordre ignoré), valeurs comparées en
+        texte (None rendu "NULL", comme la comparaison de tuples de str).
+        Chaque ligne est réduite à un bytes compact au lieu d'un tuple de str,
+        et seule la liste triée de ces bytes est gardée. Valeurs et lignes sont
+        préfixées par leur longueur : aucun séparateur ne peut entrer en collision.
+        """
+        encoded = sorted(
+            b"".join(_length_prefixed(("NULL" if x is None else str(x)).encode()) for x in r)
+            for r in rows or ()
+        )
+        digest = hashlib.blake2b()
+        for row in encoded:
+            digest.update(_length_prefixed(row))
+        return digest.digest()
 
     def score_sqlite(self, db_id: str, pred_sql: str, gold_sql: str) -> ScoredResult:
         t0 = time.perf_counter()
@@ -40,8 +56,23 @@ class BenchmarkEnrichmentService:
         pred = self.exec_service.execute("sqlite", db_id=db_id, code=pred_sql, context={}).result
         gold = self.exec_service.execute("sqlite", db_id=db_id, code=gold_sql, context={}).result
 
-        scoring_ms = (time.perf_counter() - t0) * 1000.0
+        return self._score(pred, gold, (time.perf_counter() - t0) * 1000.0)
+
+    async def score_sqlite_async(self, db_id: str, pred_sql: str, gold_sql: str) -> ScoredResult:
+        """
+        Comme score_sqlite, mais pred et gold s'exécutent en parallèle dans deux
+        threads (connexions SQLite distinctes, lectures concurrentes).
+        """
+        t0 = time.perf_counter()
+
+        pred_resp, gold_resp = await asyncio.gather(
+            asyncio.to_thread(self.exec_service.execute, "sqlite", db_id, pred_sql, {}),
+            asyncio.to_thread(self.exec_service.execute, "sqlite", db_id, gold_sql, {}),
+        )
+
+        return self._score(pred_resp.result, gold_resp.result, (time.perf_counter() - t0) * 1000.0)
 
+    def _score(self, pred: ExecutionResult, gold: ExecutionResult, scoring_ms: float) -> ScoredResult:
         pred_time = float(pred.execution_time_ms) if pred.execution_time_ms is not None else None
         gold_time = float(gold.execution_time_ms) if gold.execution_time_ms is not None else None
 
@@ -63,10 +94,9 @@ class BenchmarkEnrichmentService:
         pred_rows = pred.output or []
         gold_rows = gold.output or []
 
-        p = sorted(self._normalize_rows(pred_rows))
-        g = sorted(self._normalize_rows(gold_rows))
-
-        ok = p == g
+        ok = len(pred_rows) == len(gold_rows) and (
+            self._row_multiset_digest(pred_rows) == self._row_multiset_digest(gold_rows)
+        )
 
         return ScoredResult(
             pred_exec_success=True,
@@ -1,15 +1,45 @@
+import asyncio
 import logging
+from contextlib import AsyncExitStack, asynccontextmanager
+from os import urandom as _urandom
 from uuid import UUID, uuid4
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
 from domain.models.evaluation import EvaluationSession, TaskResult, ExecutionMetrics
+from domain.services.instance_pool import InstancePool
+
+logger = logging.getLogger(__name__)
+
+def _uuid4_batch(n: int) -> List[UUID]:
+    """n UUID v4 tirés d'un seul appel à os.urandom."""
+    blob = _urandom(16 * n)
+    return [UUID(bytes=blob[i:i + 16], version=4) for i in range(0, 16 * n, 16)]
 
 class BenchmarkService:
-    def __init__(self, repository, cloud, llm, notifier):
+    # Les TaskResult sont insérés par lots plutôt qu'un INSERT par tâche
+    RESULT_FLUSH_SIZE = 100
+    # File de progression : au-delà, on jette les plus anciens messages
+    PROGRESS_QUEUE_SIZE = 1024
+
+    def __init__(
+        self,
+        repository,
+        cloud,
+        llm,
+        notifier,
+        on_result_saved: Optional[Callable[[], None]] = None,
+        max_in_flight: int = 8,
+        instance_pool: Optional[InstancePool] = None,
+    ):
         self.repository = repository
         self.cloud = cloud
         self.llm = llm
         self.notifier = notifier
-        self.logger = logging.getLogger(__name__)
+        # Profondeur par défaut de chaque étage du pipeline (génération, exécution)
+        self.max_in_flight = max_in_flight
+        # Signal émis après chaque résultat (ex: invalider le cache du leaderboard)
+        self.on_result_saved = on_result_saved
+        # Instances chaudes partagées entre runs ; sinon une instance dédiée par run
+        self.instance_pool = instance_pool
     
     def init_session(self, team_id: UUID, model_name: str) -> UUID:
         """
@@ -30,32 +60,105 @@ class BenchmarkService:
 
         return session_id
 
-    async def run_full_benchmark(self, team_id: UUID, model_name: str, categories: List[str]):
+    async def run_full_benchmark(
+        self,
+        team_id: UUID,
+        model_name: str,
+        categories: List[str],
+        session_id: Optional[UUID] = None,
+    ):
         """
         Orchestrateur principal du benchmark.
+        Si session_id est fourni (cf. init_session), la session existante est
+        reprise pour que la progression arrive sur le bon websocket.
         """
         # 1. Initialisation de la session
-        session_id = uuid4()
+        session = self.repository.get_session_by_session_id(session_id) if session_id else None
+        if session is None:
+            session = EvaluationSession(
+                id=uuid4(),
+                team_id=team_id,
+                session_id=session_id or uuid4(),
+                language="Multi",
+                model_name=model_name,
+                status="running"
+            )
+            self.repository.save_evaluation_session(session)
+        session_id = session.session_id
         tasks = self.repository.get_tasks_by_categories(categories)
-        
-        session = EvaluationSession(
-            id=uuid4(),
-            team_id=team_id,
-            session_id=session_id,
-            language="Multi",
-            model_name=model_name,
-            status="running"
-        )
-        self.repository.save_evaluation_session(session)
 
-        instance = await self.cloud.provision_instance()
-        
-        try:
-            for index, task in enumerate(tasks):
+        instance_stack = AsyncExitStack()
+        instance = await instance_stack.enter_async_context(self._acquire_instance())
+
+        total = len(tasks)
+        # Profondeur du pipeline : calée sur la concurrence du worker distant
+        depth = instance.get("max_concurrency", self.max_in_flight)
+        pending_results: List[TaskResult] = []
+
+        def _flush_results():
+            if not pending_results:
+                return
+            self.repository.save_task_results_bulk(list(pending_results))
+            pending_results.clear()
+            if self.on_result_saved is not None:
+                self.on_result_saved()
+
+        # La progression est publiée par une tâche dédiée : la boucle de
+        # benchmark ne paie pas la latence du notifier.
+        progress_q: asyncio.Queue = asyncio.Queue(maxsize=self.PROGRESS_QUEUE_SIZE)
+
+        async def _drain_progress():
+            while True:
+                msg = await progress_q.get()
+                try:
+                    await self.notifier.publish_progress(msg)
+                except Exception as e:
+                    logger.warning("Progress notification failed: %s", e)
+                finally:
+                    progress_q.task_done()
+
+        def _publish_progress(msg: dict):
+            try:
+                progress_q.put_nowait(msg)
+            except asyncio.QueueFull:
+                # Messages de progression cumulatifs : le plus ancien peut sauter
+                progress_q.get_nowait()
+                progress_q.task_done()
+                progress_q.put_nowait(msg)
+
+        publisher = asyncio.create_task(_drain_progress())
+
+        # Pipeline en trois étages reliés par des files : génération LLM ->
+        # exécution worker -> collecte. Une génération terminée part tout de
+        # suite à l'exécution, sans attendre les autres tâches.
+        todo: asyncio.Queue = asyncio.Queue()
+        for task in tasks:
+            todo.put_nowait(task)
+        gen_cq: asyncio.Queue = asyncio.Queue(maxsize=depth)
+        exec_cq: asyncio.Queue = asyncio.Queue(maxsize=depth)
+
+        async def _generate():
+            while True:
+                try:
+                    task = todo.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
                 generated_code = await self.llm.generate_code(task.content, model_name)
-                
+                await gen_cq.put((task, generated_code))
+
+        async def _generate_all():
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(depth):
+                    tg.create_task(_generate())
+            # Plus rien à générer : un marqueur de fin par exécuteur
+            for _ in range(depth):
+                await gen_cq.put(None)
+
+        async def _execute():
+            while (item := await gen_cq.get()) is not None:
+                task, generated_code = item
                 execution_response = await self.cloud.send_task_to_worker(
-                    instance["url"], 
+                    instance["url"],
                     {
                         "code": generated_code,
                         "context": task.contexts[0].schema_definition,
@@ -63,11 +166,17 @@ class BenchmarkService:
                     }
                 )
 
-                is_correct = self._verify_gold_standard(execution_response, task.gold_code)
-                silver_score = self._calculate_silver_score(execution_response, task)
+                # Gold : sortie identique à l'attendu ; Silver : exécution réussie
+                is_correct = execution_response.get("output") == execution_response.get("expected_output")
+                silver_score = 1.0 if execution_response.get("status") == "success" else 0.0
+                await exec_cq.put((task, generated_code, execution_response, is_correct, silver_score))
 
+        async def _collect():
+            result_ids = _uuid4_batch(total)
+            for current, result_id in enumerate(result_ids, 1):
+                task, generated_code, execution_response, is_correct, silver_score = await exec_cq.get()
                 result = TaskResult(
-                    id=uuid4(),
+                    id=result_id,
                     evaluation_id=session.id,
                     question_id=task.id,
                     generated_code=generated_code,
@@ -82,60 +191,58 @@ class BenchmarkService:
                     )
                 )
 
-                self.repository.save_task_result(result)
-                await self.notifier.publish_progress({
-                    "session_id": str(session_id),
-                    "current": index + 1,
-                    "total": len(tasks),
+                pending_results.append(result)
+                if len(pending_results) >= self.RESULT_FLUSH_SIZE:
+                    _flush_results()
+                _publish_progress({
+                    "session_id": session_id,
+                    "current": current,
+                    "total": total,
                     "last_result": is_correct
                 })
 
+        try:
+            # Une erreur dans n'importe quel étage annule tout le pipeline
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(_generate_all())
+                for _ in range(depth):
+                    tg.create_task(_execute())
+                tg.create_task(_collect())
+
             session.status = "completed"
             
-        except Exception as e:
-            self.logger.error(f"Benchmark failed: {e}")
+        except Exception:
+            logger.exception("Benchmark failed (session %s)", session_id)
             session.status = "failed"
         finally:
-            self.repository.update_session_status(session.id, session.status)
-            self.cloud.terminate_instance(instance["pod_id"])
+            # Chaque étape du nettoyage s'exécute même si une précédente lève
+            # (rappels d'AsyncExitStack : ordre inverse de l'enregistrement)
+            async with AsyncExitStack() as cleanup:
+                cleanup.callback(publisher.cancel)
+                cleanup.push_async_callback(progress_q.join)
+                cleanup.push_async_callback(instance_stack.aclose)
+                cleanup.callback(self.repository.update_session_status, session.id, session.status)
+                # Les résultats déjà obtenus sont gardés même si le run échoue
+                cleanup.callback(_flush_results)
     
+    @asynccontextmanager
+    async def _acquire_instance(self):
+        if self.instance_pool is not None:
+            async with self.instance_pool.acquire() as instance:
+                yield instance
+            return
+        instance = await self.cloud.provision_instance()
+        try:
+            yield instance
+        finally:
+            self.cloud.terminate_instance(instance["pod_id"])
+
     def get_leaderboard(self) -> List[Dict[str, Any]]:
         """
-        Retourne un classement agrégé par team.
-        Le calcul exact dépend de ton modèle, ici un exemple:
+        Retourne un classement agrégé par team, déjà trié par le repository:
         - total_tasks
         - correct_count
         - avg_silver_score
         - final_score = correct_count + avg_silver_score
         """
-        rows = self.repository.get_leaderboard_rows()
-
-        leaderboard = []
-        for r in rows:
-            correct_count = int(r["correct_count"])
-            total_tasks = int(r["total_tasks"])
-            avg_silver = float(r["avg_silver_score"])
-            final_score = correct_count + avg_silver
-
-            leaderboard.append(
-                {
-                    "team_id": r["team_id"],
-                    "team_name": r.get("team_name"),
-                    "total_tasks": total_tasks,
-                    "correct_count": correct_count,
-                    "avg_silver_score": avg_silver,
-                    "final_score": final_score,
-                }
-            )
-
-        leaderboard.sort(key=lambda x: x["final_score"], reverse=True)
-        return leaderboard
-
-    def _verify_gold_standard(self, response: dict, gold_code: str) -> bool:
-        """Compare l'output du worker avec le résultat attendu."""
-        return response.get("output") == response.get("expected_output")
-
-    def _calculate_silver_score(self, response: dict, task) -> float:
-        """Calcule la proximité de l'état des variables (Silver Standard)."""
-        captured_state = response.get("captured_state", {})
-        return 1.0 if response.get("status") == "success" else 0.0
\ No newline at end of file
+        return self.repository.get_leaderboard()
@@ -1,11 +1,59 @@
+import csv
+import itertools
 import os
 import sqlite3
-import pandas as pd
+import threading
+from collections import OrderedDict
+from pathlib import Path
 from uuid import uuid4
-from typing import List
+from typing import List, Tuple
 from domain.models.task import DataContext
 
+# Connexions SQLite en lecture seule gardées ouvertes entre deux
+# introspections du même fichier (LRU) : pas de réouverture ni de relecture
+# de l'en-tête/du cache de pages à chaque ré-enregistrement.
+SQLITE_CONN_CACHE_SIZE = 16
+_sqlite_conns: "OrderedDict[str, Tuple[Tuple[int, int], sqlite3.Connection]]" = OrderedDict()
+_sqlite_lock = threading.Lock()
+
+
+def _sqlite_connection(path: str) -> sqlite3.Connection:
+    """À appeler sous _sqlite_lock."""
+    resolved = Path(path).resolve()
+    st = resolved.stat()
+    # Fichier ouvert en immutable : s'il a changé depuis, on rouvre
+    stamp = (st.st_mtime_ns, st.st_size)
+    key = str(resolved)
+
+    cached = _sqlite_conns.get(key)
+    if cached is not None:
+        if cached[0] == stamp:
+            _sqlite_conns.move_to_end(key)
+            return cached[1]
+        del _sqlite_conns[key]
+        cached[1].close()
+
+    conn = sqlite3.connect(resolved.as_uri() + "?mode=ro&immutable=1", uri=True, check_same_thread=False)
+    conn.execute("PRAGMA query_only=1")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-65536")
+    _sqlite_conns[key] = (stamp, conn)
+    if len(_sqlite_conns) > SQLITE_CONN_CACHE_SIZE:
+        _, (_, oldest) = _sqlite_conns.popitem(last=False)
+        oldest.close()
+    return conn
+
+# Valeurs lues comme NaN par pandas.read_csv (na_values par défaut)
+_CSV_NA_VALUES = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+_CSV_BOOL_VALUES = frozenset({"True", "False", "true", "false", "TRUE", "FALSE"})
+
 class DatasetService:
+    # Lignes lues pour deviner le type des colonnes d'un CSV
+    CSV_SAMPLE_ROWS = 50
+
     def __init__(self, repository):
         self.repository = repository
 
@@ -38,28 +86,68 @@ class DatasetService:
         return dataset
 
     def _extract_sqlite_schema(self, path: str) -> dict:
-        """Extrait la structure d'une base SQLite."""
-        conn = sqlite3.connect(path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = cursor.fetchall()
-        
-        db_schema = {}
-        for (table_name,) in tables:
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [{"name": col[1], "type": col[2]} for col in cursor.fetchall()]
-            db_schema[table_name] = columns
-        conn.close()
-        return db_schema
+        """
+        Extrait la structure d'une base SQLite en une seule requête
+        (sqlite_master x pragma_table_info), en lecture seule, sur une
+        connexion réutilisée.
+        """
+        # register_dataset tourne dans le threadpool : une connexion n'est
+        # utilisée que par un thread à la fois
+        with _sqlite_lock:
+            rows = _sqlite_connection(path).execute(
+                "SELECT m.name, p.name, p.type "
+                "FROM sqlite_master m, pragma_table_info(m.name) p "
+                "WHERE m.type = 'table' "
+                "ORDER BY m.name, p.cid"
+            ).fetchall()
+
+        return {
+            table_name: [{"name": col, "type": typ} for _, col, typ in cols]
+            for table_name, cols in itertools.groupby(rows, key=lambda r: r[0])
+        }
 
     def _extract_csv_schema(self, path: str) -> dict:
-        """Extrait les colonnes d'un CSV via Pandas."""
-        df = pd.read_csv(path, nrows=1)
+        """
+        Extrait les colonnes d'un CSV avec le module csv : en-tête + quelques
+        lignes pour deviner le type (mêmes noms de types que pandas).
+        """
+        with open(path, newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            sample = list(itertools.islice(reader, self.CSV_SAMPLE_ROWS))
+
+        columns = []
+        for i, col in enumerate(header):
+            # Cellule absente (ligne courte) ou vide : NaN côté pandas
+            cells = [row[i] if i < len(row) else "" for row in sample]
+            columns.append({"name": col, "type": self._infer_csv_type(cells)})
+
         return {
             "table_name": os.path.basename(path).split('.')[0],
-            "columns": [{"name": col, "type": str(dtype)} for col, dtype in df.dtypes.items()]
+            "columns": columns,
         }
 
+    @staticmethod
+    def _infer_csv_type(cells: List[str]) -> str:
+        if not cells:
+            return "object"  # en-tête seul : pandas ne peut rien inférer
+        values = [v for v in cells if v not in _CSV_NA_VALUES]
+        has_na = len(values) < len(cells)
+        if not values:
+            return "float64"  # colonne vide : NaN partout, comme pandas
+        if all(v in _CSV_BOOL_VALUES for v in values):
+            # Pas de NaN dans une colonne bool numpy : pandas passe en object
+            return "object" if has_na else "bool"
+        for cast, dtype in ((int, "int64"), (float, "float64")):
+            try:
+                for v in values:
+                    cast(v)
+            except ValueError:
+                continue
+            # Entiers avec des trous : NaN force le float64
+            return "float64" if has_na else dtype
+        return "object"
+
     def list_datasets(self) -> List[DataContext]:
         return self.repository.get_all_contexts()
 
@@ -2,13 +2,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Any, Dict, Literal, Optional
 
-from domain.ports.executor import ExecutionResult
+from domain.ports.executor import ExecutionResult, ExecutorPort
 from infrastructure.executor import DatasetLocator, make_executor, ExecutorKind
 
 
-@dataclass(frozen=True)
+# Les executors recopient déjà le contexte : inutile d'en refaire une copie ici
+_NO_CONTEXT = MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True)
 class ExecutionRequest:
     executor_kind: ExecutorKind
     db_id: str
@@ -16,7 +21,7 @@ class ExecutionRequest:
     context: Dict[str, Any] | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExecutionResponse:
     executor_kind: ExecutorKind
     db_id: str
@@ -26,6 +31,14 @@ class ExecutionResponse:
 class ExecutionService:
     def __init__(self, datasets_root: str):
         self.locator = DatasetLocator(datasets_root)
+        # Un executor par type, réutilisé : ils ne gardent aucun état par db_id
+        self._executors: Dict[ExecutorKind, ExecutorPort] = {}
+
+    def _executor(self, executor_kind: ExecutorKind) -> ExecutorPort:
+        executor = self._executors.get(executor_kind)
+        if executor is None:
+            executor = self._executors.setdefault(executor_kind, make_executor(executor_kind, self.locator))
+        return executor
 
     def execute(
         self,
@@ -34,10 +47,8 @@ class ExecutionService:
         code: str,
         context: Optional[Dict[str, Any]] = None,
     ) -> ExecutionResponse:
-        ctx = dict(context or {})
-
-        executor = make_executor(executor_kind, self.locator)
-        res = executor.execute(code=code, db_id=db_id, context=ctx)
+        ctx = context if context is not None else _NO_CONTEXT
+        res = self._executor(executor_kind).execute(code=code, db_id=db_id, context=ctx)
 
         return ExecutionResponse(
             executor_kind=executor_kind,
@@ -1,19 +1,44 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import logging
 import uuid
 from dataclasses import dataclass
-from typing import Any, AsyncGenerator, Dict
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+import orjson
 
 from domain.ports.worker_selector import WorkerSelectorPort
 from domain.ports.benchmark_repository import BenchmarkRepositoryPort
-from domain.services.benchmark_enrichment_service import BenchmarkEnrichmentService
+from domain.services.benchmark_enrichment_service import BenchmarkEnrichmentService, ScoredResult
 from infrastructure.sse.sse_client import aiter_sse_events
 
 
+logger = logging.getLogger(__name__)
+
+# Intervalle de vérification de la déconnexion du client SSE (secondes)
+DISCONNECT_POLL_S = 0.5
+# Sans événement du worker pendant HEARTBEAT_S secondes, un commentaire SSE
+# est envoyé pour que les proxies ne coupent pas la connexion inactive
+HEARTBEAT_S = 15.0
+_KEEPALIVE = b": keepalive\n\n"
+# Écritures bench_events / bench_items regroupées : par lots de
+# WRITE_BATCH_SIZE lignes, ou au plus tard toutes les WRITE_FLUSH_S secondes
+WRITE_BATCH_SIZE = 50
+WRITE_FLUSH_S = 0.1
+
+
+# En-têtes des événements émis à chaque run, encodés une fois pour toutes
+_SSE_PREFIXES = {
+    event: f"event: {event}\ndata: ".encode()
+    for event in ("meta", "status", "result", "done", "error")
+}
+
+
 def sse(event: str, data: Dict[str, Any]) -> bytes:
-    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8")
+    prefix = _SSE_PREFIXES.get(event) or f"event: {event}\ndata: ".encode()
+    # orjson produit directement de l'UTF-8 (équivalent de ensure_ascii=False)
+    return prefix + orjson.dumps(data) + b"\n\n"
 
 
 @dataclass(frozen=True)
@@ -23,6 +48,83 @@ class GlobalStreamDeps:
     enrich: BenchmarkEnrichmentService
 
 
+async def _wait_for_disconnect(request) -> None:
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_S)
+
+
+class _RunWriteBuffer:
+    """
+    Tampon des écritures d'un run : le flux SSE n'attend plus Postgres,
+    une tâche de fond insère les lignes par lots (execute_values).
+    """
+
+    def __init__(self, repo: BenchmarkRepositoryPort, run_id: uuid.UUID, run_created: asyncio.Future):
+        self.repo = repo
+        self.run_id = run_id
+        # INSERT bench_runs en cours : events / items y font référence (clé étrangère)
+        self._run_created = run_created
+        self._events: List[Tuple[str, Dict[str, Any]]] = []
+        self._items: List[Dict[str, Any]] = []
+        self._full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._flush_loop())
+
+    def log_event(self, event_type: str, payload: Dict[str, Any]) -> None:
+        self._events.append((event_type, payload))
+        if len(self._events) >= WRITE_BATCH_SIZE:
+            self._full.set()
+
+    def insert_item(self, item: Dict[str, Any]) -> None:
+        self._items.append(item)
+        if len(self._items) >= WRITE_BATCH_SIZE:
+            self._full.set()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), WRITE_FLUSH_S)
+            except TimeoutError:
+                pass
+            self._full.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._events and not self._items:
+                return
+            # Attente de l'INSERT du run avant de prendre le lot : une annulation
+            # ici laisse les lignes en tampon (écrites par close()), et shield()
+            # n'annule pas create_run pour autant
+            try:
+                await asyncio.shield(self._run_created)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Bench run %s was not created, dropping buffered writes", self.run_id)
+                self._events, self._items = [], []
+                return
+            events, self._events = self._events, []
+            items, self._items = self._items, []
+            try:
+                # Un seul passage par le pool de threads et une transaction par lot
+                await asyncio.to_thread(self.repo.write_batch, self.run_id, events, items)
+            except Exception:
+                logger.exception(
+                    "Bench writes failed (run %s, %d events, %d items)", self.run_id, len(events), len(items)
+                )
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        # Dernier lot écrit même si le flux est annulé pendant l'écriture
+        await asyncio.shield(self.flush())
+
+
 class GlobalBenchmarkStreamService:
     def __init__(self, deps: GlobalStreamDeps):
         self.deps = deps
@@ -36,21 +138,26 @@ class GlobalBenchmarkStreamService:
         request,
     ) -> AsyncGenerator[bytes, None]:
         run_id = uuid.uuid4()
+        run_id_str = str(run_id)
 
         worker_base = await self.deps.worker_selector.select_worker_url()
         worker_url = f"{worker_base}/bench/complete/stream"
 
-        await asyncio.to_thread(
-            self.deps.repo.create_run,
-            run_id,
-            model_id,
-            revision,
-            db_id,
-            params,
+        # Le run est créé en base pendant que le flux démarre : le premier
+        # octet SSE n'attend pas l'INSERT, seules les écritures du tampon l'attendent.
+        run_created = asyncio.ensure_future(
+            asyncio.to_thread(
+                self.deps.repo.create_run,
+                run_id,
+                model_id,
+                revision,
+                db_id,
+                params,
+            )
         )
 
         meta = {
-            "run_id": str(run_id),
+            "run_id": run_id_str,
             "worker_url": worker_url,
             "model_id": model_id,
             "revision": revision,
@@ -58,8 +165,8 @@ class GlobalBenchmarkStreamService:
             **params,
         }
 
-        await asyncio.to_thread(self.deps.repo.log_event, run_id, "meta", meta)
-        yield sse("meta", meta)
+        writes = _RunWriteBuffer(self.deps.repo, run_id, run_created)
+        writes.log_event("meta", meta)
 
         worker_payload = {
             "model": model_id,
@@ -69,60 +176,90 @@ class GlobalBenchmarkStreamService:
         }
 
         final_status = "ok"
+        # La déconnexion est surveillée en parallèle de l'attente du worker :
+        # pas besoin d'attendre le prochain événement (génération LLM en
+        # cours) pour arrêter, et la fermeture du flux amont stoppe le worker.
+        upstream = aiter_sse_events(worker_url, worker_payload)
+        disconnected = asyncio.create_task(_wait_for_disconnect(request))
+        next_ev = None
+        writes.start()
         try:
-            async for ev in aiter_sse_events(worker_url, worker_payload):
-                if await request.is_disconnected():
+            yield sse("meta", meta)
+
+            while True:
+                if next_ev is None or next_ev.done():
+                    next_ev = asyncio.ensure_future(anext(upstream, None))
+                done, _ = await asyncio.wait(
+                    {next_ev, disconnected}, timeout=HEARTBEAT_S, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # Le worker est toujours en train de générer : on garde la même attente
+                    yield _KEEPALIVE
+                    continue
+                if not next_ev.done():
                     final_status = "client_disconnected"
                     break
+                ev = next_ev.result()
+                if ev is None:
+                    break
+
+                # ev.data vient d'être décodé et n'est partagé avec personne :
+                # on le complète sur place plutôt que d'en copier les clés
+                ev.data["run_id"] = run_id_str
 
                 if ev.event == "status":
-                    payload = {**ev.data, "run_id": str(run_id)}
-                    await asyncio.to_thread(self.deps.repo.log_event, run_id, "status", payload)
-                    yield sse("status", payload)
+                    writes.log_event("status", ev.data)
+                    yield sse("status", ev.data)
                     continue
 
                 if ev.event == "result":
-                    base = {**ev.data, "run_id": str(run_id)}
+                    base = ev.data
                     pred_sql = base.get("sql")
                     gold_sql = base.get("gold_sql")
                     item_db_id = base.get("db_id") or db_id
 
                     if isinstance(pred_sql, str) and isinstance(gold_sql, str) and isinstance(item_db_id, str):
-                        score = await asyncio.to_thread(self.deps.enrich.score_sqlite, item_db_id, pred_sql, gold_sql)
-                        base["scoring"] = {
-                            "pred_exec_success": score.pred_exec_success,
-                            "gold_exec_success": score.gold_exec_success,
-                            "is_correct": score.is_correct,
-                            "pred_error": score.pred_error,
-                            "gold_error": score.gold_error,
-                            "rows_pred": score.rows_pred,
-                            "rows_gold": score.rows_gold,
-                            "match_kind": score.match_kind,
-                            "pred_exec_time_ms": score.pred_exec_time_ms,
-                            "gold_exec_time_ms": score.gold_exec_time_ms,
-                            "scoring_time_ms": score.scoring_time_ms,
-                        }
-
-                    await asyncio.to_thread(self.deps.repo.log_event, run_id, "result", base)
-                    await asyncio.to_thread(self.deps.repo.insert_item, run_id, base)
+                        score = await self.deps.enrich.score_sqlite_async(item_db_id, pred_sql, gold_sql)
+                        # Champs tous scalaires : lecture directe des slots, sans la copie profonde d'asdict()
+                        base["scoring"] = {name: getattr(score, name) for name in ScoredResult.__slots__}
+
+                    writes.log_event("result", base)
+                    writes.insert_item(base)
                     yield sse("result", base)
                     continue
 
                 if ev.event == "done":
-                    done_payload = {**ev.data, "run_id": str(run_id)}
-                    await asyncio.to_thread(self.deps.repo.log_event, run_id, "done", done_payload)
-                    yield sse("done", done_payload)
+                    writes.log_event("done", ev.data)
+                    yield sse("done", ev.data)
                     break
 
-                passthrough = {**ev.data, "run_id": str(run_id)}
-                await asyncio.to_thread(self.deps.repo.log_event, run_id, ev.event, passthrough)
-                yield sse(ev.event, passthrough)
+                writes.log_event(ev.event, ev.data)
+                yield sse(ev.event, ev.data)
+
+        except asyncio.CancelledError:
+            # Starlette annule le flux quand le client ferme la connexion
+            final_status = "client_disconnected"
+            raise
 
         except Exception as e:
             final_status = "error"
-            err = {"run_id": str(run_id), "error": f"{type(e).__name__}: {e}"}
-            await asyncio.to_thread(self.deps.repo.log_event, run_id, "error", err)
+            err = {"run_id": run_id_str, "error": f"{type(e).__name__}: {e}"}
+            writes.log_event("error", err)
             yield sse("error", err)
 
         finally:
+            disconnected.cancel()
+            if next_ev is not None and not next_ev.done():
+                next_ev.cancel()
+                await asyncio.wait({next_ev})
+            await upstream.aclose()
+            # Tout ce qui est en tampon est écrit avant de clore le run
+            await writes.close()
+            # shield : end_run n'est lancé qu'une fois create_run terminé, sans l'annuler
+            try:
+                await asyncio.shield(run_created)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Bench run %s was not created", run_id)
             await asyncio.to_thread(self.deps.repo.end_run, run_id, final_status)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
+from threading import Lock
 from typing import Optional, List
 from uuid import UUID
 
+from cachetools import TTLCache
+
 from domain.ports.repository import RepositoryPort
 from domain.models.hackathon import Hackathon
 from domain.exceptions import (
@@ -12,6 +15,12 @@ from domain.exceptions import (
     HackathonAlreadyExists,
     HackathonInvalidDates,
 )
+from domain.services.team_service import invalidate_team_cache
+
+_UTC = timezone.utc
+
+_hackathon_cache: TTLCache = TTLCache(maxsize=1024, ttl=10)
+_hackathon_cache_lock = Lock()
 
 class HackathonService:
     def __init__(self, repository: RepositoryPort):
@@ -35,15 +44,21 @@ class HackathonService:
             name=name,
             start_date=start_date,
             end_date=end_date,
-            created_at=datetime.utcnow(),
+            created_at=datetime.now(_UTC),
         )
         self.repo.create_hackathon(h)
         return h
 
     def get_hackathon(self, hackathon_id: UUID) -> Hackathon:
+        with _hackathon_cache_lock:
+            h = _hackathon_cache.get(hackathon_id)
+        if h is not None:
+            return h
         h = self.repo.get_hackathon_by_id(hackathon_id)
         if h is None:
             raise HackathonNotFound(hackathon_id)
+        with _hackathon_cache_lock:
+            _hackathon_cache[hackathon_id] = h
         return h
 
     def list_hackathons(self) -> List[Hackathon]:
@@ -54,3 +69,7 @@ class HackathonService:
         if h is None:
             raise HackathonNotFound(hackathon_id)
         self.repo.delete_hackathon(hackathon_id)
+        with _hackathon_cache_lock:
+            _hackathon_cache.pop(hackathon_id, None)
+        # Les équipes du hackathon sont supprimées en cascade
+        invalidate_team_cache()
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class InstancePool:
+    """
+    Pool d'instances de workers déjà provisionnées (comme un pool de connexions).
+    Les benchmarks empruntent une instance chaude au lieu de payer le cold start
+    du provider (30-90s sur RunPod) à chaque run ; les instances inutilisées
+    depuis plus de `idle_ttl` secondes sont détruites, sauf les `min_size` premières.
+    Une instance chaude est re-vérifiée (cloud.is_healthy) avant d'être prêtée.
+    """
+
+    def __init__(self, cloud, min_size: int = 0, max_size: int = 4, idle_ttl: float = 300.0):
+        self.cloud = cloud
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        # (instance, instant de libération), la plus anciennement libérée à gauche
+        self._idle: Deque[Tuple[Dict[str, Any], float]] = deque()
+        self._slots = asyncio.Semaphore(max_size)
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        # Pré-provisionnement en tâche de fond : le démarrage de l'app n'attend pas le provider
+        self._tasks.append(asyncio.create_task(self._prewarm()))
+        self._tasks.append(asyncio.create_task(self._reap_idle()))
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        while self._idle:
+            instance, _ = self._idle.popleft()
+            await self._terminate(instance)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Dict[str, Any]]:
+        async with self._slots:
+            instance = await self._take_idle()
+            if instance is None:
+                instance = await self.cloud.provision_instance()
+            healthy = False
+            try:
+                yield instance
+                healthy = True
+            finally:
+                if healthy:
+                    self._idle.append((instance, time.monotonic()))
+                else:
+                    # Erreur pendant l'emprunt : on ne remet pas une instance douteuse dans le pool
+                    await self._terminate(instance)
+
+    async def _take_idle(self) -> Optional[Dict[str, Any]]:
+        # Instance la plus récemment libérée d'abord ; celles qui ne répondent
+        # plus (pod arrêté par le provider, conteneur mort) sont détruites
+        while self._idle:
+            instance, _ = self._idle.pop()
+            try:
+                healthy = await self.cloud.is_healthy(instance["url"])
+            except Exception as e:
+                logger.warning("Instance %s health check failed: %s", instance.get("pod_id"), e)
+                healthy = False
+            if healthy:
+                return instance
+            await self._terminate(instance)
+        return None
+
+    async def _prewarm(self) -> None:
+        for _ in range(self.min_size):
+            async with self._slots:
+                try:
+                    instance = await self.cloud.provision_instance()
+                except Exception as e:
+                    logger.warning("Instance pre-warm failed: %s", e)
+                    return
+                self._idle.append((instance, time.monotonic()))
+
+    async def _reap_idle(self) -> None:
+        while True:
+            await asyncio.sleep(self.idle_ttl / 2)
+            deadline = time.monotonic() - self.idle_ttl
+            while len(self._idle) > self.min_size and self._idle[0][1] < deadline:
+                instance, _ = self._idle.popleft()
+                await self._terminate(instance)
+
+    async def _terminate(self, instance: Dict[str, Any]) -> None:
+        try:
+            # terminate_instance est synchrone (SDK RunPod / docker)
+            await asyncio.to_thread(self.cloud.terminate_instance, instance["pod_id"])
+        except Exception as e:
+            logger.warning("Instance %s termination failed: %s", instance.get("pod_id"), e)
@@ -1,9 +1,16 @@
+from threading import Lock
 from uuid import UUID, uuid4
 from typing import List
 
+from cachetools import TTLCache
+
 from domain.models.identity import Participant
 from domain.ports.repository import RepositoryPort
 from domain.exceptions import ParticipantNotFound
+from domain.services.team_service import invalidate_team_cache
+
+_participant_cache: TTLCache = TTLCache(maxsize=1024, ttl=10)
+_participant_cache_lock = Lock()
 
 
 class ParticipantService:
@@ -29,10 +36,20 @@ class ParticipantService:
         return self.repository.get_all_participants()
 
     def get_participant(self, participant_id: UUID) -> Participant:
+        with _participant_cache_lock:
+            participant = _participant_cache.get(participant_id)
+        if participant is not None:
+            return participant
         participant = self.repository.get_participant_by_id(participant_id)
         if participant is None:
             raise ParticipantNotFound(participant_id)
+        with _participant_cache_lock:
+            _participant_cache[participant_id] = participant
         return participant
 
     def delete_participant(self, participant_id: UUID):
         self.repository.delete_participant(participant_id)
+        with _participant_cache_lock:
+            _participant_cache.pop(participant_id, None)
+        # Le participant disparaît aussi des équipes en cache
+        invalidate_team_cache()
@@ -1,11 +1,29 @@
+from threading import Lock
 from uuid import UUID, uuid4
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List
 
+from cachetools import TTLCache
+
 from domain.models.identity import Team, Participant
 from domain.ports.repository import RepositoryPort
 from domain.exceptions import TeamNotFound
 
+_UTC = timezone.utc
+
+# Lectures par id très fréquentes (websocket, pages d'équipe) : cache court,
+# partagé par les instances de service (une par requête).
+_team_cache: TTLCache = TTLCache(maxsize=1024, ttl=10)
+_team_cache_lock = Lock()
+
+
+def invalidate_team_cache(team_id: UUID = None) -> None:
+    with _team_cache_lock:
+        if team_id is None:
+            _team_cache.clear()
+        else:
+            _team_cache.pop(team_id, None)
+
 
 class TeamService:
     def __init__(self, repository:RepositoryPort):
@@ -16,7 +34,7 @@ class TeamService:
             id=uuid4(),
             name=name,
             hackathon_id=hackathon_id,
-            created_at=datetime.utcnow(),
+            created_at=datetime.now(_UTC),
             members=[]
         )
         self.repository.save_team(team)
@@ -26,19 +44,32 @@ class TeamService:
         return self.repository.get_teams_by_hackathon(hackathon_id)
 
     def get_team(self, team_id: UUID) -> Team:
+        with _team_cache_lock:
+            team = _team_cache.get(team_id)
+        if team is not None:
+            return team
         team = self.repository.get_team_by_id(team_id)
         if team is None:
             raise TeamNotFound(team_id)
+        with _team_cache_lock:
+            _team_cache[team_id] = team
         return team
 
     def delete_team(self, team_id: UUID):
         self.repository.delete_team(team_id)
+        invalidate_team_cache(team_id)
 
     def add_participant_to_team(self, team_id: UUID, participant_id: UUID):
         self.repository.add_participant_to_team(team_id, participant_id)
+        invalidate_team_cache(team_id)
+
+    def add_participants_to_team(self, team_id: UUID, participant_ids: List[UUID]) -> None:
+        self.repository.add_participants_to_team(team_id, participant_ids)
+        invalidate_team_cache(team_id)
 
     def remove_participant_from_team(self, team_id: UUID, participant_id: UUID) -> None:
         team = self.repository.get_team_by_id(team_id)
         if team is None:
             raise TeamNotFound(team_id)
         self.repository.remove_participant_from_team(team_id, participant_id)
+        invalidate_team_cache(team_id)
@@ -1,13 +1,19 @@
+import asyncio
 import docker
-import time
 import httpx
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from domain.ports.cloud import CloudProviderPort
 
 class LocalCloudAdapter(CloudProviderPort):
-    def __init__(self, image_name: str = "benchmark-worker-local"):
+    def __init__(self, image_name: str = "benchmark-worker-local", http: Optional[httpx.AsyncClient] = None):
         self.client = docker.from_env()
         self.image_name = image_name
+        # Client partagé de l'app si fourni ; sinon un client propre à l'adaptateur,
+        # réutilisé pour tous les appels au worker (keep-alive) et fermé par aclose()
+        self._owns_http = http is None
+        self.http = http or httpx.AsyncClient(
+            timeout=30.0, limits=httpx.Limits(max_keepalive_connections=20)
+        )
         self.container = None
 
     async def provision_instance(self) -> Dict[str, Any]:
@@ -23,7 +29,7 @@ class LocalCloudAdapter(CloudProviderPort):
         )
         
         # On laisse un peu de temps au serveur interne pour démarrer
-        time.sleep(2) 
+        await asyncio.sleep(2)
         
         return {
             "pod_id": self.container.id,
@@ -32,16 +38,19 @@ class LocalCloudAdapter(CloudProviderPort):
 
     async def send_task_to_worker(self, worker_url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Identique à l'adaptateur RunPod, mais sur localhost."""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{worker_url}/execute",
-                    json=payload,
-                    timeout=30.0
-                )
-                return response.json()
-            except Exception as e:
-                return {"status": "error", "error": str(e)}
+        try:
+            response = await self.http.post(
+                f"{worker_url}/execute",
+                json=payload,
+                timeout=30.0
+            )
+            return response.json()
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+
+    async def aclose(self) -> None:
+        if self._owns_http:
+            await self.http.aclose()
 
     def terminate_instance(self, pod_id: str):
         """Arrête le conteneur local."""
@@ -53,10 +62,9 @@ class LocalCloudAdapter(CloudProviderPort):
         """
         Vérifie si le worker dans le conteneur est prêt à recevoir des requêtes.
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                # On tente d'appeler l'URL racine ou un endpoint de santé
-                response = await client.get(f"{worker_url}/", timeout=1.0)
-                return response.status_code == 200
-            except (httpx.RequestError, httpx.HTTPStatusError):
-                return False
\ No newline at end of file
+        try:
+            # On tente d'appeler l'URL racine ou un endpoint de santé
+            response = await self.http.get(f"{worker_url}/", timeout=1.0)
+            return response.status_code == 200
+        except (httpx.RequestError, httpx.HTTPStatusError):
+            return False
\ No newline at end of file
@@ -3,30 +3,31 @@ import httpx
 import time
 import logging
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from domain.ports.cloud import CloudProviderPort
 
+logger = logging.getLogger(__name__)
+
 class RunPodAdapter(CloudProviderPort):
-    def __init__(self, api_key: str, worker_image: str):
+    def __init__(self, api_key: str, worker_image: str, http: Optional[httpx.AsyncClient] = None):
         runpod.api_key = api_key
         self.worker_image = worker_image
-        self.logger = logging.getLogger(__name__)
+        self.http = http or httpx.AsyncClient()
 
     async def is_healthy(self, worker_url: str) -> bool:
         """
         Vérifie si le serveur FastAPI à l'intérieur du Pod RunPod répond.
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                # On interroge l'endpoint racine du worker
-                response = await client.get(f"{worker_url}/", timeout=2.0)
-                return response.status_code == 200
-            except (httpx.RequestError, httpx.HTTPStatusError):
-                return False
+        try:
+            # On interroge l'endpoint racine du worker
+            response = await self.http.get(f"{worker_url}/", timeout=2.0)
+            return response.status_code == 200
+        except (httpx.RequestError, httpx.HTTPStatusError):
+            return False
 
     async def provision_instance(self, gpu_type: str = "NVIDIA GeForce RTX 3090") -> Dict[str, Any]:
         """Lance un pod et attend qu'il soit 'READY' ET 'HEALTHY'."""
-        self.logger.info(f"Provisioning RunPod instance with image {self.worker_image}...")
+        logger.info("Provisioning RunPod instance with image %s...", self.worker_image)
         
         pod = runpod.create_pod(
             name="benchmark-worker",
@@ -58,10 +59,10 @@ class RunPodAdapter(CloudProviderPort):
                 
                 # 2. Vérifier si notre application interne répond
                 if await self.is_healthy(url):
-                    self.logger.info(f"Pod {pod_id} is healthy and ready.")
+                    logger.info("Pod %s is healthy and ready.", pod_id)
                     return {"pod_id": pod_id, "url": url}
                 
-                self.logger.info(f"Pod {pod_id} is running, waiting for worker API...")
+                logger.info("Pod %s is running, waiting for worker API...", pod_id)
             
             # Pause asynchrone pour ne pas bloquer l'event loop
             await asyncio.sleep(5)
@@ -70,15 +71,14 @@ class RunPodAdapter(CloudProviderPort):
 
     async def send_task_to_worker(self, worker_url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Envoie le code à exécuter au worker distant via HTTP."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{worker_url}/execute",
-                json=payload,
-                timeout=90.0 # Plus long pour les tâches complexes
-            )
-            return response.json()
+        response = await self.http.post(
+            f"{worker_url}/execute",
+            json=payload,
+            timeout=90.0 # Plus long pour les tâches complexes
+        )
+        return response.json()
 
     def terminate_instance(self, pod_id: str):
         """Détruit le pod pour arrêter la facturation."""
         runpod.terminate_pod(pod_id)
-        self.logger.info(f"Pod {pod_id} terminated.")
\ No newline at end of file
+        logger.info("Pod %s terminated.", pod_id)
\ No newline at end of file
@@ -1,13 +1,15 @@
 import httpx
-from typing import Any
+from typing import Any, Optional
 
 from domain.ports.llm import LLMProviderPort
 
 
 class OpenAIAdapter(LLMProviderPort):
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, client: Optional[httpx.AsyncClient] = None):
         self.api_key = api_key
         self.url = "https://api.openai.com/v1/chat/completions"
+        # Client partagé (keep-alive, HTTP/2) : pas de handshake TLS par appel
+        self.client = client or httpx.AsyncClient()
 
     async def generate_code(self, prompt: str, model_name: str, context_schema: dict) -> str:
         system_prompt = (
@@ -26,10 +28,9 @@ class OpenAIAdapter(LLMProviderPort):
             "temperature": 0,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(self.url, json=payload, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            result = response.json()
+        response = await self.client.post(self.url, json=payload, headers=headers, timeout=30.0)
+        response.raise_for_status()
+        result = response.json()
 
         code = result["choices"][0]["message"]["content"]
         return code.replace("```python", "").replace("```sql", "").replace("```", "").strip()
@@ -67,10 +68,9 @@ class OpenAIAdapter(LLMProviderPort):
             "temperature": 0,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(self.url, json=payload, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            result = response.json()
+        response = await self.client.post(self.url, json=payload, headers=headers, timeout=30.0)
+        response.raise_for_status()
+        result = response.json()
 
         raw = result["choices"][0]["message"]["content"].strip()
 
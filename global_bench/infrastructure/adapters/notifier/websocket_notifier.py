@@ -1,34 +1,101 @@
-from typing import Dict, List
+import asyncio
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Optional
+import orjson
 from fastapi import WebSocket
 from domain.ports.notifier import NotifierPort
 
+JSON_OPTIONS = orjson.OPT_SERIALIZE_UUID | orjson.OPT_NAIVE_UTC
+
 class ConnectionManager:
     def __init__(self):
         # On stocke les connexions par session_id pour ne pas polluer tout le monde
-        self.active_connections: Dict[str, List[WebSocket]] = {}
+        # (indexées par id(websocket) : ajout et retrait en O(1))
+        self.active_connections: Dict[str, Dict[int, WebSocket]] = {}
+        self._closed: Dict[WebSocket, asyncio.Event] = {}
 
     async def connect(self, websocket: WebSocket, session_id: str):
         await websocket.accept()
-        if session_id not in self.active_connections:
-            self.active_connections[session_id] = []
-        self.active_connections[session_id].append(websocket)
+        self.active_connections.setdefault(session_id, {})[id(websocket)] = websocket
+        self._closed[websocket] = asyncio.Event()
 
     def disconnect(self, websocket: WebSocket, session_id: str):
-        if session_id in self.active_connections:
-            self.active_connections[session_id].remove(websocket)
+        closed = self._closed.pop(websocket, None)
+        if closed is not None:
+            closed.set()
+        connections = self.active_connections.get(session_id)
+        if connections and connections.pop(id(websocket), None) is not None and not connections:
+            del self.active_connections[session_id]
+
+    async def wait_until_disconnected(self, websocket: WebSocket, session_id: str):
+        """
+        Garde la connexion ouverte jusqu'à la déconnexion du client.
+        Les messages entrants sont ignorés sans décodage : on ne lit le flux ASGI
+        que pour voir passer le 'websocket.disconnect'.
+        """
+        closed = self._closed[websocket]
+        try:
+            while not closed.is_set():
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+        finally:
+            self.disconnect(websocket, session_id)
 
     async def broadcast_to_session(self, session_id: str, message: dict):
-        if session_id in self.active_connections:
-            for connection in self.active_connections[session_id]:
-                await connection.send_json(message)
+        connections = self.active_connections.get(session_id)
+        if not connections:
+            return
+        # Encodé une seule fois (orjson) puis envoyé tel quel à chaque client
+        payload = orjson.dumps(message, option=JSON_OPTIONS)
+        # Envois en parallèle sur un instantané de la liste : un client lent ne
+        # retarde pas les autres
+        targets = list(connections.values())
+        results = await asyncio.gather(
+            *(connection.send_bytes(payload) for connection in targets),
+            return_exceptions=True,
+        )
+        for connection, result in zip(targets, results):
+            if isinstance(result, Exception):
+                # Client parti entre deux frames : on le retire
+                self.disconnect(connection, session_id)
 
 class WebSocketNotifier(NotifierPort):
-    def __init__(self, manager: ConnectionManager):
+    """
+    Les événements de progression sont bufferisés par session et envoyés par
+    lots toutes les `flush_interval` secondes : un seul frame {"events": [...]}
+    au lieu d'un send_json par résultat de tâche.
+    Chaque événement est encodé (orjson) dès sa publication ; le frame final
+    ne fait que concaténer les octets déjà produits.
+    """
+
+    def __init__(self, manager: ConnectionManager, flush_interval: float = 0.1):
         self.manager = manager
+        self.flush_interval = flush_interval
+        self._pending: Dict[Any, Deque[orjson.Fragment]] = defaultdict(deque)
+        self._flush_task: Optional[asyncio.Task] = None
 
     async def publish_progress(self, data: dict):
+        # session_id peut rester un UUID : orjson le sérialise nativement et
+        # la conversion en str n'est faite qu'une fois par flush.
         session_id = data.get("session_id")
         if session_id is None:
             raise ValueError("No session id provided")
-        session_id = str(session_id)
-        await self.manager.broadcast_to_session(session_id, data)
\ No newline at end of file
+        self._pending[session_id].append(orjson.Fragment(orjson.dumps(data, option=JSON_OPTIONS)))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+        await asyncio.sleep(0)
+
+    async def _flush_later(self):
+        # Des événements publiés pendant un flush (broadcast en cours) ne
+        # relancent pas de tâche : on reboucle tant qu'il en reste
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+            if not self._pending:
+                return
+
+    async def flush(self):
+        pending, self._pending = self._pending, defaultdict(deque)
+        for session_id, events in pending.items():
+            await self.manager.broadcast_to_session(str(session_id), {"events": list(events)})
@@ -1,82 +1,186 @@
 from __future__ import annotations
 
-import json
+import threading
 import uuid
-from typing import Any, Dict
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
 
+import orjson
 import psycopg2
+from psycopg2.extras import Json, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
 from domain.ports.benchmark_repository import BenchmarkRepositoryPort
 
 
+_ITEM_COLUMNS = """
+    run_id, idx, question_id, db_id, source_index,
+    raw_answer, sql, gold_sql, gen_time_ms, metrics,
+    pred_exec_success, gold_exec_success, is_correct,
+    pred_error, gold_error, rows_pred, rows_gold, match_kind
+"""
+_ITEM_TEMPLATE = """(
+    %s,%s,%s,%s,%s,
+    %s,%s,%s,%s,%s,
+    %s,%s,%s,
+    %s,%s,%s,%s,%s
+)"""
+
+_ITEM_PLACEHOLDERS = ",".join(f"${i}" for i in range(1, _ITEM_COLUMNS.count(",") + 2))
+
+# Requêtes unitaires préparées une fois par connexion du pool (PREPARE) :
+# Postgres ne les ré-analyse plus à chaque appel. Les types des paramètres
+# sont déduits des colonnes cibles.
+_PREPARED: Dict[str, str] = {
+    "bench_create_run": """
+        INSERT INTO bench_runs(run_id, model_id, revision, db_id, params, status)
+        VALUES ($1,$2,$3,$4,$5,'running')
+    """,
+    "bench_end_run": "UPDATE bench_runs SET ended_at = NOW(), status = $1 WHERE run_id = $2",
+    "bench_log_event": "INSERT INTO bench_events(run_id, event_type, payload) VALUES ($1,$2,$3)",
+    "bench_insert_item": f"INSERT INTO bench_items({_ITEM_COLUMNS}) VALUES ({_ITEM_PLACEHOLDERS})",
+}
+
+
+class _Jsonb(Json):
+    """Adaptateur psycopg2 : le dict est sérialisé une seule fois, par orjson."""
+
+    def dumps(self, obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _item_row(run_id: uuid.UUID, item: Dict[str, Any]) -> tuple:
+    scoring = item.get("scoring") or {}
+    return (
+        str(run_id),
+        item.get("index"),
+        item.get("question_id"),
+        item.get("db_id"),
+        item.get("source_index"),
+        item.get("raw_answer"),
+        item.get("sql"),
+        item.get("gold_sql"),
+        item.get("gen_time_ms"),
+        _Jsonb(item.get("metrics") or {}),
+        scoring.get("pred_exec_success"),
+        scoring.get("gold_exec_success"),
+        scoring.get("is_correct"),
+        scoring.get("pred_error"),
+        scoring.get("gold_error"),
+        scoring.get("rows_pred"),
+        scoring.get("rows_gold"),
+        scoring.get("match_kind"),
+    )
+
+
 class BenchmarkRepositoryPG(BenchmarkRepositoryPort):
-    def __init__(self, dsn: str):
+    """
+    Les méthodes sont appelées via asyncio.to_thread : connexions prises dans
+    un pool thread-safe plutôt qu'un psycopg2.connect (TCP + auth) par événement.
+    """
+
+    def __init__(self, dsn: str, min_size: int = 2, max_size: int = 16):
         self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self._pool: ThreadedConnectionPool | None = None
+        self._pool_lock = threading.Lock()
+        # Connexions sur lesquelles _PREPARED a déjà été exécuté
+        self._prepared_conns: weakref.WeakSet = weakref.WeakSet()
 
-    def create_run(self, run_id: uuid.UUID, model_id: str, revision: str, db_id: str, params: Dict[str, Any]) -> None:
-        with psycopg2.connect(self.dsn) as conn:
+    def _get_pool(self) -> ThreadedConnectionPool:
+        # Créé au premier appel : le Container peut exister sans base joignable
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadedConnectionPool(self.min_size, self.max_size, self.dsn)
+        return self._pool
+
+    @contextmanager
+    def _connect(self) -> Iterator[psycopg2.extensions.connection]:
+        pool = self._get_pool()
+        conn = pool.getconn()
+        try:
+            # `with conn` : commit ou rollback, sans fermer la connexion
+            with conn:
+                yield conn
+        finally:
+            pool.putconn(conn, close=conn.closed != 0)
+
+    def _exec(self, statement: str, params: tuple) -> None:
+        with self._connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    INSERT INTO bench_runs(run_id, model_id, revision, db_id, params, status)
-                    VALUES (%s,%s,%s,%s,%s::jsonb,'running')
-                    """,
-                    (str(run_id), model_id, revision, db_id, json.dumps(params)),
-                )
+                prepared = conn in self._prepared_conns
+                if not prepared:
+                    self._prepare(cur)
+                cur.execute(f"EXECUTE {statement}({','.join(['%s'] * len(params))})", params)
+                if not prepared:
+                    self._prepared_conns.add(conn)
+
+    @staticmethod
+    def _prepare(cur) -> None:
+        # Après un échec en cours de préparation, on ne refait que les
+        # requêtes encore absentes de la session
+        cur.execute("SELECT name FROM pg_prepared_statements")
+        existing = {name for (name,) in cur.fetchall()}
+        for name, sql in _PREPARED.items():
+            if name not in existing:
+                cur.execute(f"PREPARE {name} AS {sql}")
+
+    def create_run(self, run_id: uuid.UUID, model_id: str, revision: str, db_id: str, params: Dict[str, Any]) -> None:
+        self._exec(
+            "bench_create_run",
+            (str(run_id), model_id, revision, db_id, _Jsonb(params)),
+        )
 
     def end_run(self, run_id: uuid.UUID, status: str) -> None:
-        with psycopg2.connect(self.dsn) as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    "UPDATE bench_runs SET ended_at = NOW(), status = %s WHERE run_id = %s",
-                    (status, str(run_id)),
-                )
+        self._exec(
+            "bench_end_run",
+            (status, str(run_id)),
+        )
 
     def log_event(self, run_id: uuid.UUID, event_type: str, payload: Dict[str, Any]) -> None:
-        with psycopg2.connect(self.dsn) as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    "INSERT INTO bench_events(run_id, event_type, payload) VALUES (%s,%s,%s::jsonb)",
-                    (str(run_id), event_type, json.dumps(payload)),
-                )
+        self._exec(
+            "bench_log_event",
+            (str(run_id), event_type, _Jsonb(payload)),
+        )
 
     def insert_item(self, run_id: uuid.UUID, item: Dict[str, Any]) -> None:
-        scoring = item.get("scoring") or {}
-        with psycopg2.connect(self.dsn) as conn:
+        self._exec(
+            "bench_insert_item",
+            _item_row(run_id, item),
+        )
+
+    def log_events_bulk(self, run_id: uuid.UUID, events: List[Tuple[str, Dict[str, Any]]]) -> None:
+        self.write_batch(run_id, events, [])
+
+    def insert_items_bulk(self, run_id: uuid.UUID, items: List[Dict[str, Any]]) -> None:
+        self.write_batch(run_id, [], items)
+
+    def write_batch(
+        self,
+        run_id: uuid.UUID,
+        events: List[Tuple[str, Dict[str, Any]]],
+        items: List[Dict[str, Any]],
+    ) -> None:
+        if not events and not items:
+            return
+        # Une connexion, une transaction pour les deux tables
+        with self._connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    INSERT INTO bench_items(
-                      run_id, idx, question_id, db_id, source_index,
-                      raw_answer, sql, gold_sql, gen_time_ms, metrics,
-                      pred_exec_success, gold_exec_success, is_correct,
-                      pred_error, gold_error, rows_pred, rows_gold, match_kind
+                if events:
+                    execute_values(
+                        cur,
+                        "INSERT INTO bench_events(run_id, event_type, payload) VALUES %s",
+                        [(str(run_id), event_type, _Jsonb(payload)) for event_type, payload in events],
+                        template="(%s,%s,%s)",
                     )
-                    VALUES (
-                      %s,%s,%s,%s,%s,
-                      %s,%s,%s,%s,%s::jsonb,
-                      %s,%s,%s,
-                      %s,%s,%s,%s,%s
+                if items:
+                    # Un lot rejoué (retry) ne doit pas faire échouer les autres lignes
+                    execute_values(
+                        cur,
+                        f"INSERT INTO bench_items({_ITEM_COLUMNS}) VALUES %s ON CONFLICT (run_id, idx) DO NOTHING",
+                        [_item_row(run_id, item) for item in items],
+                        template=_ITEM_TEMPLATE,
                     )
-                    """,
-                    (
-                        str(run_id),
-                        item.get("index"),
-                        item.get("question_id"),
-                        item.get("db_id"),
-                        item.get("source_index"),
-                        item.get("raw_answer"),
-                        item.get("sql"),
-                        item.get("gold_sql"),
-                        item.get("gen_time_ms"),
-                        json.dumps(item.get("metrics") or {}),
-                        scoring.get("pred_exec_success"),
-                        scoring.get("gold_exec_success"),
-                        scoring.get("is_correct"),
-                        scoring.get("pred_error"),
-                        scoring.get("gold_error"),
-                        scoring.get("rows_pred"),
-                        scoring.get("rows_gold"),
-                        scoring.get("match_kind"),
-                    ),
-                )
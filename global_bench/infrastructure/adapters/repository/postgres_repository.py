@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from dataclasses import asdict
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
-from sqlalchemy.orm import Session
-from sqlalchemy import func, Integer, cast
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, Integer, cast, select, bindparam, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from infrastructure.persistence.tables import HackathonTable
 
@@ -25,6 +27,47 @@ from infrastructure.persistence.tables import (
 )
 
 
+# Ajout idempotent de membres : les doublons sont ignorés côté Postgres
+_ADD_TEAM_MEMBERS = pg_insert(team_members).on_conflict_do_nothing(
+    index_elements=[team_members.c.team_id, team_members.c.participant_id]
+)
+
+# Requêtes chaudes construites une seule fois à l'import : la clé de cache de
+# compilation SQLAlchemy reste stable d'un appel à l'autre.
+_TASKS_BY_CATEGORIES = select(QuestionTable).where(
+    QuestionTable.category.in_(bindparam("categories", expanding=True))
+)
+
+_correct_count = func.coalesce(func.sum(cast(TaskResultTable.is_correct, Integer)), 0)
+_avg_silver_score = func.coalesce(func.avg(TaskResultTable.silver_score), 0.0)
+_final_score = (_correct_count + _avg_silver_score).label("final_score")
+
+# Lectures pures : colonnes Core, pas d'hydratation d'objets ORM.
+# Score et tri calculés par Postgres (index task_results(evaluation_id) INCLUDE ...).
+_LEADERBOARD = (
+    select(
+        TeamTable.id.label("team_id"),
+        TeamTable.name.label("team_name"),
+        func.count(TaskResultTable.id).label("total_tasks"),
+        _correct_count.label("correct_count"),
+        _avg_silver_score.label("avg_silver_score"),
+        _final_score,
+    )
+    .join(EvaluationTable, EvaluationTable.team_id == TeamTable.id)
+    .join(TaskResultTable, TaskResultTable.evaluation_id == EvaluationTable.id)
+    .group_by(TeamTable.id, TeamTable.name)
+    .order_by(_final_score.desc())
+)
+
+_ALL_CONTEXTS = select(
+    DataContextTable.id,
+    DataContextTable.name,
+    DataContextTable.schema_definition,
+    DataContextTable.storage_link,
+    DataContextTable.is_active,
+)
+
+
 class PostgresRepository(RepositoryPort):
     def __init__(self, session: Session):
         self.session = session
@@ -45,28 +88,14 @@ class PostgresRepository(RepositoryPort):
         self.session.commit()
 
     def get_all_contexts(self) -> List[DataContext]:
-        rows = self.session.query(DataContextTable).all()
-        return [
-            DataContext(
-                id=c.id,
-                name=c.name,
-                schema_definition=c.schema_definition,
-                storage_link=c.storage_link,
-                is_active=c.is_active,
-            )
-            for c in rows
-        ]
+        return [DataContext(**row) for row in self.session.execute(_ALL_CONTEXTS).mappings()]
 
     def delete_context(self, context_id: UUID) -> None:
         self.session.query(DataContextTable).filter_by(id=context_id).delete()
         self.session.commit()
 
     def get_tasks_by_categories(self, categories: List[str]) -> List[Question]:
-        rows = (
-            self.session.query(QuestionTable)
-            .filter(QuestionTable.category.in_(categories))
-            .all()
-        )
+        rows = self.session.scalars(_TASKS_BY_CATEGORIES, {"categories": list(categories)}).all()
         return [self._map_to_question_domain(q) for q in rows]
 
     def get_task_by_id(self, task_id: UUID) -> Optional[Question]:
@@ -95,18 +124,14 @@ class PostgresRepository(RepositoryPort):
         self.session.commit()
 
     def save_task_result(self, result: TaskResult) -> None:
-        db_result = TaskResultTable(
-            id=result.id,
-            evaluation_id=result.evaluation_id,
-            question_id=result.question_id,
-            generated_code=result.generated_code,
-            is_correct=result.is_correct,
-            silver_score=result.silver_score,
-            generation_duration=result.generation_duration,
-            execution_metrics=getattr(result, "execution_metrics", None)
-            or (result.metrics.__dict__ if getattr(result, "metrics", None) else None),
-        )
-        self.session.add(db_result)
+        self.session.add(TaskResultTable(**self._task_result_row(result)))
+        self.session.commit()
+
+    def save_task_results_bulk(self, results: List[TaskResult]) -> None:
+        if not results:
+            return
+        # insert() Core + liste de dicts : un seul executemany (insertmanyvalues)
+        self.session.execute(insert(TaskResultTable), [self._task_result_row(r) for r in results])
         self.session.commit()
 
     def get_session_by_id(self, session_db_id: UUID) -> Optional[EvaluationSession]:
@@ -171,53 +196,39 @@ class PostgresRepository(RepositoryPort):
             self.session.commit()
 
     def get_team_by_id(self, team_id: UUID) -> Optional[Team]:
-        t = self.session.query(TeamTable).filter_by(id=team_id).first()
+        t = self.session.scalars(
+            select(TeamTable)
+            .where(TeamTable.id == team_id)
+            .options(selectinload(TeamTable.members))
+        ).first()
         if not t:
             return None
 
-        return Team(
-            id=t.id,
-            name=t.name,
-            hackathon_id=t.hackathon_id,
-            created_at=t.created_at,
-            members=self._get_team_members(team_id),
-        )
+        return self._map_to_team_domain(t)
 
     def delete_team(self, team_id: UUID) -> None:
         self.session.query(TeamTable).filter_by(id=team_id).delete()
         self.session.commit()
 
     def get_teams_by_hackathon(self, hackathon_id: UUID) -> List[Team]:
-        teams = self.session.query(TeamTable).filter_by(hackathon_id=hackathon_id).all()
-        return [
-            Team(
-                id=t.id,
-                name=t.name,
-                hackathon_id=t.hackathon_id,
-                created_at=t.created_at,
-                members=self._get_team_members(t.id),
-            )
-            for t in teams
-        ]
+        # 1 SELECT teams + 1 SELECT ... IN (...) pour tous les membres (pas de N+1)
+        teams = self.session.scalars(
+            select(TeamTable)
+            .where(TeamTable.hackathon_id == hackathon_id)
+            .options(selectinload(TeamTable.members))
+        ).all()
+        return [self._map_to_team_domain(t) for t in teams]
 
     def add_participant_to_team(self, team_id: UUID, participant_id: UUID) -> None:
-        exists = (
-            self.session.query(team_members)
-            .filter(
-                team_members.c.team_id == team_id,
-                team_members.c.participant_id == participant_id,
-            )
-            .first()
-        )
+        self.add_participants_to_team(team_id, [participant_id])
 
-        if exists:
+    def add_participants_to_team(self, team_id: UUID, participant_ids: List[UUID]) -> None:
+        if not participant_ids:
             return
-
+        # Un seul executemany au lieu d'un SELECT + INSERT par participant
         self.session.execute(
-            team_members.insert().values(
-                team_id=team_id,
-                participant_id=participant_id,
-            )
+            _ADD_TEAM_MEMBERS,
+            [{"team_id": team_id, "participant_id": pid} for pid in participant_ids],
         )
         self.session.commit()
 
@@ -346,55 +357,46 @@ class PostgresRepository(RepositoryPort):
         ]
 
     def get_leaderboard(self) -> List[Dict[str, Any]]:
-        q = (
-            self.session.query(
-                TeamTable.id.label("team_id"),
-                TeamTable.name.label("team_name"),
-                func.count(TaskResultTable.id).label("total_tasks"),
-                func.sum(cast(TaskResultTable.is_correct, Integer)).label("correct_tasks"),
-            )
-            .join(EvaluationTable, EvaluationTable.team_id == TeamTable.id)
-            .join(TaskResultTable, TaskResultTable.evaluation_id == EvaluationTable.id)
-            .group_by(TeamTable.id, TeamTable.name)
-            .order_by(func.sum(cast(TaskResultTable.is_correct, Integer)).desc())
-        )
-
-        out: List[Dict[str, Any]] = []
-        for row in q.all():
-            total = int(row.total_tasks or 0)
-            correct = int(row.correct_tasks or 0)
-            score = (correct / total * 100.0) if total > 0 else 0.0
-            out.append(
-                {
-                    "team_id": row.team_id,
-                    "team_name": row.team_name,
-                    "total_tasks": total,
-                    "correct_tasks": correct,
-                    "score": score,
-                }
-            )
-        return out
+        """
+        Classement agrégé par team (team_id, team_name, total_tasks,
+        correct_count, avg_silver_score, final_score), trié par final_score.
+        """
+        return [dict(row) for row in self.session.execute(_LEADERBOARD).mappings()]
 
     # =========================
     # Private helpers / mappers
     # =========================
 
-    def _get_team_members(self, team_id: UUID) -> List[Participant]:
-        rows = (
-            self.session.query(ParticipantTable)
-            .join(team_members, team_members.c.participant_id == ParticipantTable.id)
-            .filter(team_members.c.team_id == team_id)
-            .all()
+    def _map_to_team_domain(self, t: TeamTable) -> Team:
+        return Team(
+            id=t.id,
+            name=t.name,
+            hackathon_id=t.hackathon_id,
+            created_at=t.created_at,
+            members=[
+                Participant(
+                    id=p.id,
+                    first_name=p.first_name,
+                    last_name=p.last_name,
+                    email=p.email,
+                )
+                for p in t.members
+            ],
         )
-        return [
-            Participant(
-                id=p.id,
-                first_name=p.first_name,
-                last_name=p.last_name,
-                email=p.email,
-            )
-            for p in rows
-        ]
+
+    def _task_result_row(self, result: TaskResult) -> Dict[str, Any]:
+        return {
+            "id": result.id,
+            "evaluation_id": result.evaluation_id,
+            "question_id": result.question_id,
+            "generated_code": result.generated_code,
+            "is_correct": result.is_correct,
+            "silver_score": result.silver_score,
+            "generation_duration": result.generation_duration,
+            "execution_metrics": getattr(result, "execution_metrics", None)
+            or (asdict(result.metrics) if getattr(result, "metrics", None) else None),
+            "created_at": result.created_at,
+        }
 
     def _map_to_question_domain(self, db_q: QuestionTable) -> Question:
         return Question(
@@ -1,108 +1,211 @@
 from __future__ import annotations
+import contextlib
+import threading
 import time
 import traceback
 import tracemalloc
+import types
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import polars as pl
 
 from domain.ports.executor import ExecutorPort, ExecutionResult
 from infrastructure.executor.dataset.dataset_locator import DatasetLocator
-from infrastructure.executor.dataset.parquet_loader import load_parquet_tables, ParquetLoadConfig
+from infrastructure.executor.dataset.parquet_loader import load_parquet_tables, parquet_dataset_stamp, ParquetLoadConfig
+from infrastructure.executor.hard_timeout import hard_timeout
+from infrastructure.executor.memory_sampler import RssWindow, rss_sampler
+from infrastructure.executor.snippet import compile_snippet
+
+# Plans LazyFrame conservés par (code, db_id, contexte) quand reuse_lazy_plan est actif (LRU)
+PLAN_CACHE_SIZE = 256
+
+def _context_key(context: Optional[Dict[str, Any]]) -> Optional[Tuple[Any, ...]]:
+    """Empreinte du contexte injecté ; None s'il contient des valeurs non hachables (pas de cache)."""
+    key = tuple(sorted((context or {}).items()))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+def _traced_peak_mb() -> float:
+    _, peak = tracemalloc.get_traced_memory()
+    return float(peak) / (1024.0 * 1024.0)
 
 @dataclass(frozen=True)
 class PolarsExecutorConfig:
     timeout_ms: int = 3000
     auto_collect_lazy: bool = True
-    capture_all_locals: bool = True
+    # Par défaut seuls result/output sont capturés ; True : toutes les variables du snippet
+    capture_all_locals: bool = False
     capture_keys: Optional[list[str]] = None
-    parquet_eager: bool = True  # DF vs LazyFrame
+    # Tables injectées en LazyFrame (scan_parquet) : Polars ne lit que les
+    # colonnes/lignes utiles à la requête. True pour du code écrit en eager.
+    parquet_eager: bool = False
+    collect_engine: str = "streaming"  # moteur du collect() final des LazyFrame
+    # Pic mémoire : par défaut, croissance du RSS du process échantillonnée par le
+    # thread partagé (memory_sampling). tracemalloc (memory_profiling) est exact
+    # mais taxe chaque allocation : opt-in, prioritaire s'il est activé
+    memory_profiling: bool = False
+    memory_sampling: bool = True
+    # timeout_ms imposé par SIGALRM pendant l'exécution (thread principal POSIX)
+    hard_timeout: bool = False
+    # Snippet rejoué sur le même db_id et le même contexte : le LazyFrame produit
+    # la première fois est re-collecté tel quel, sans exec(). Le snippet ne doit
+    # pas avoir d'effet de bord, et l'état capturé se limite alors à `result`.
+    reuse_lazy_plan: bool = False
 
 class PolarsExecutor(ExecutorPort):
     def __init__(self, locator: DatasetLocator, config: PolarsExecutorConfig | None = None):
         self.locator = locator
         self.config = config or PolarsExecutorConfig()
+        self._plan_cache: "OrderedDict[Tuple[Any, ...], Tuple[Any, pl.LazyFrame]]" = OrderedDict()
+        self._plan_lock = threading.Lock()
+
+    def _cached_plan(self, key: Tuple[Any, ...], stamp: Any) -> Optional[pl.LazyFrame]:
+        with self._plan_lock:
+            cached = self._plan_cache.get(key)
+            if cached is None or cached[0] != stamp:
+                return None
+            self._plan_cache.move_to_end(key)
+            return cached[1]
+
+    def _store_plan(self, key: Tuple[Any, ...], stamp: Any, plan: pl.LazyFrame) -> None:
+        with self._plan_lock:
+            self._plan_cache[key] = (stamp, plan)
+            self._plan_cache.move_to_end(key)
+            while len(self._plan_cache) > PLAN_CACHE_SIZE:
+                self._plan_cache.popitem(last=False)
 
     def execute(self, code: str, db_id: str, context: Dict[str, Any]) -> ExecutionResult:
         t0 = time.perf_counter()
-        tracemalloc.start()
-
-        locals_dict: Dict[str, Any] = dict(context)
-        locals_dict["pl"] = pl
-        locals_dict["db_id"] = db_id
+        window: RssWindow | None = None
+        if self.config.memory_profiling:
+            tracemalloc.start()
+        elif self.config.memory_sampling:
+            window = rss_sampler.start()
 
         parquet_dir = self.locator.parquet_dir(db_id)
-        tables = load_parquet_tables(parquet_dir, ParquetLoadConfig(eager=self.config.parquet_eager))
-        locals_dict.update(tables)  # each table accessible directly by table_name
-        locals_dict["tables"] = tables
+        load_cfg = ParquetLoadConfig(eager=self.config.parquet_eager)
+        context_key = _context_key(context) if self.config.reuse_lazy_plan else None
+        plan_key = (code, db_id, context_key)
+        stamp: Any = None
+        plan: Optional[pl.LazyFrame] = None
+        if context_key is not None:
+            # Même estampille que le cache des tables : un fichier réécrit sur place invalide le plan
+            stamp = parquet_dataset_stamp(parquet_dir, load_cfg.dir_mtime_only)
+            plan = self._cached_plan(plan_key, stamp)
+
+        locals_dict: Dict[str, Any]
+        tables: Dict[str, Any] = {}
+        if plan is not None:
+            locals_dict = {"result": plan}
+        else:
+            tables = load_parquet_tables(parquet_dir, load_cfg)
+            # Dict simple et non ChainMap : exec() résout chaque nom via les locals,
+            # une ChainMap y ajoute un __getitem__ Python. Construit en une seule
+            # expression (fusion des dicts en C) ; chaque table accessible par son nom.
+            locals_dict = {**(context or {}), "pl": pl, "db_id": db_id, **tables, "tables": tables}
 
         globals_dict: Dict[str, Any] = {"__builtins__": __builtins__, "pl": pl}
 
         try:
-            compiled = compile(code, "<polars_executor>", "exec")
-
             def _guard() -> None:
                 if (time.perf_counter() - t0) * 1000.0 > self.config.timeout_ms:
                     raise TimeoutError(f"Execution timed out after {self.config.timeout_ms} ms")
 
             _guard()
-            exec(compiled, globals_dict, locals_dict)
-            _guard()
+            # Le collect() final compte dans le délai : c'est là que tourne la requête
+            with self._deadline(t0):
+                if plan is None:
+                    compiled, is_expr = compile_snippet(code, "<polars_executor>")
+                    if is_expr:
+                        locals_dict["result"] = eval(compiled, globals_dict, locals_dict)
+                    else:
+                        exec(compiled, globals_dict, locals_dict)
+                    _guard()
 
-            output = locals_dict.get("result", locals_dict.get("output", None))
-            if self.config.auto_collect_lazy and isinstance(output, pl.LazyFrame):
-                output = output.collect()
+                output = locals_dict.get("result", locals_dict.get("output", None))
+                if context_key is not None and plan is None and isinstance(output, pl.LazyFrame):
+                    self._store_plan(plan_key, stamp, output)
+                if self.config.auto_collect_lazy and isinstance(output, pl.LazyFrame):
+                    output = output.collect(engine=self.config.collect_engine)
 
-            cur, peak = tracemalloc.get_traced_memory()
-            peak_mb = float(peak) / (1024.0 * 1024.0)
+            peak_mb = self._peak_mb(window)
             elapsed_ms = (time.perf_counter() - t0) * 1000.0
 
             return ExecutionResult(
                 success=True,
                 output=output,
-                captured_state=self._capture_state(locals_dict),
+                captured_state=self._capture_state(locals_dict, context, tables),
                 execution_time_ms=elapsed_ms,
                 memory_peak_mb=peak_mb,
                 error=None,
             )
 
         except Exception as e:
-            cur, peak = tracemalloc.get_traced_memory()
-            peak_mb = float(peak) / (1024.0 * 1024.0)
+            peak_mb = self._peak_mb(window)
             elapsed_ms = (time.perf_counter() - t0) * 1000.0
 
             return ExecutionResult(
                 success=False,
                 output=None,
-                captured_state=self._capture_state(locals_dict),
+                captured_state=self._capture_state(locals_dict, context, tables),
                 execution_time_ms=elapsed_ms,
                 memory_peak_mb=peak_mb,
                 error=f"{type(e).__name__}: {e}\n{traceback.format_exc()}",
             )
         finally:
-            tracemalloc.stop()
-
-    def _capture_state(self, locals_dict: Dict[str, Any]) -> Dict[str, Any]:
+            if self.config.memory_profiling:
+                tracemalloc.stop()
+            elif window is not None:
+                rss_sampler.stop(window)
+
+    def _deadline(self, t0: float):
+        if not self.config.hard_timeout:
+            return contextlib.nullcontext(False)
+        return hard_timeout(
+            self.config.timeout_ms / 1000.0 - (time.perf_counter() - t0),
+            f"Execution timed out after {self.config.timeout_ms} ms",
+        )
+
+    def _peak_mb(self, window: RssWindow | None) -> float:
+        if self.config.memory_profiling:
+            return _traced_peak_mb()
+        if window is not None:
+            return rss_sampler.stop(window)
+        return 0.0
+
+    def _capture_state(
+        self, locals_dict: Dict[str, Any], context: Dict[str, Any], tables: Dict[str, Any]
+    ) -> Dict[str, Any]:
         if self.config.capture_keys is not None:
             return {k: locals_dict.get(k) for k in self.config.capture_keys if k in locals_dict}
         if not self.config.capture_all_locals:
-            return {}
+            return {k: self._state_value(locals_dict[k]) for k in ("result", "output") if k in locals_dict}
 
+        # Seuls les noms introduits par le snippet sont inspectés (pas le contexte ni les tables injectées)
+        injected = {"pl", "db_id", "tables"}
+        injected.update(context or ())
+        injected.update(tables)
         state: Dict[str, Any] = {}
         for k, v in locals_dict.items():
-            if k.startswith("__") or k in ("pl",):
-                continue
-            if callable(v) or hasattr(v, "__spec__"):
+            if k in injected or k.startswith("__"):
                 continue
-            if isinstance(v, (pl.DataFrame, pl.LazyFrame)):
-                try:
-                    if isinstance(v, pl.LazyFrame):
-                        state[k] = {"__type__": "LazyFrame", "schema": {n: str(t) for n, t in v.schema.items()}}
-                    else:
-                        state[k] = {"__type__": "DataFrame", "shape": v.shape, "columns": v.columns}
-                except Exception:
-                    state[k] = {"__type__": type(v).__name__}
+            if callable(v) or isinstance(v, types.ModuleType):
                 continue
-            state[k] = v
+            state[k] = self._state_value(v)
         return state
+
+    @staticmethod
+    def _state_value(v: Any) -> Any:
+        if isinstance(v, (pl.DataFrame, pl.LazyFrame)):
+            try:
+                if isinstance(v, pl.LazyFrame):
+                    return {"__type__": "LazyFrame", "schema": {n: str(t) for n, t in v.collect_schema().items()}}
+                return {"__type__": "DataFrame", "shape": v.shape, "columns": v.columns}
+            except Exception:
+                return {"__type__": type(v).__name__}
+        return v
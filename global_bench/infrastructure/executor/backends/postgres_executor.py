@@ -1,60 +1,218 @@
 from __future__ import annotations
+import csv
+import io
+import itertools
+import os
+import re
+import threading
 import time
 import traceback
+import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import psycopg2
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 
 from domain.ports.executor import ExecutorPort, ExecutionResult
 
+# Requête unique de lecture : exécutable derrière un DECLARE ... CURSOR
+_STREAMABLE_RE = re.compile(r"^\s*(select|with|values|table)\b", re.IGNORECASE)
+
+def _is_streamable(code: str) -> bool:
+    return bool(_STREAMABLE_RE.match(code)) and ";" not in code.strip().rstrip(";")
+
 @dataclass(frozen=True)
 class PostgresExecutorConfig:
     timeout_ms: int = 2500
     max_rows: int = 2000
+    fetch_size: int = 200  # lignes par FETCH du curseur serveur
     read_only: bool = True
     set_statement_timeout: bool = True
+    pool_min: int = 1
+    pool_max: int = 8
+    # Lecture via COPY (...) TO STDOUT (CSV) pour les gros résultats : pas de
+    # conversion de type ligne par ligne, mais les valeurs reviennent en texte
+    use_copy: bool = False
+    # Paramètres libpq de chaque connexion (fixés une fois par connexion du pool) :
+    # keepalives TCP pour que l'OS ne ferme pas les connexions inactives
+    application_name: str = "benchmarker"
+    keepalives_idle: int = 30
+    keepalives_interval: int = 10
+    keepalives_count: int = 3
+
+_ConnectArgs = Tuple[Tuple[Any, ...], Dict[str, Any]]
+
+# Nombre de pools gardés ouverts (un par serveur/utilisateur/db_id, LRU)
+PG_POOL_CACHE_SIZE = int(os.getenv("PG_POOL_CACHE_SIZE", "16"))
+
+class _LruPool(ThreadedConnectionPool):
+    """Pool évincé du cache : fermé dès que sa dernière connexion empruntée revient."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._retired = False
+
+    def retire(self) -> None:
+        with self._lock:
+            self._retired = True
+            if not self._used and not self.closed:
+                self._closeall()
+
+    def _putconn(self, conn, key=None, close=False):
+        super()._putconn(conn, key, close or self._retired)
+        if self._retired and not self._used and not self.closed:
+            self._closeall()
 
 class PostgresExecutor(ExecutorPort):
+    # Connexions réutilisées d'un execute à l'autre : un pool par jeu de
+    # paramètres de connexion (serveur, utilisateur, db_id), partagé par le process
+    _pools: "OrderedDict[Tuple[Any, ...], _LruPool]" = OrderedDict()
+    _pools_lock = threading.Lock()
+
     def __init__(self, config: PostgresExecutorConfig | None = None):
         self.config = config or PostgresExecutorConfig()
 
-    def execute(self, code: str, db_id: str, context: Dict[str, Any]) -> ExecutionResult:
-        t0 = time.perf_counter()
+    def _libpq_options(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        options: Dict[str, Any] = {
+            "application_name": self.config.application_name,
+            "keepalives": 1,
+            "keepalives_idle": self.config.keepalives_idle,
+            "keepalives_interval": self.config.keepalives_interval,
+            "keepalives_count": self.config.keepalives_count,
+        }
+        # hostaddr : IP déjà résolue, pas de DNS à chaque connexion (host sert encore au TLS)
+        for key in ("hostaddr", "target_session_attrs"):
+            if context.get(key):
+                options[key] = context[key]
+        return options
 
+    def _connect_args(self, context: Dict[str, Any], db_id: str) -> Optional[_ConnectArgs]:
         dsn = context.get("dsn")
         dsn_base = context.get("dsn_base")
         host = context.get("host")
-        port = context.get("port")
         user = context.get("user")
-        password = context.get("password")
+        if dsn:
+            return (dsn,), {"dbname": db_id, **self._libpq_options(context)}
+        if dsn_base:
+            return (dsn_base + f" dbname={db_id}",), self._libpq_options(context)
+        if host and user:
+            return (), {
+                "host": host,
+                "port": context.get("port") or 5432,
+                "user": user,
+                "password": context.get("password"),
+                "dbname": db_id,
+                **self._libpq_options(context),
+            }
+        return None
+
+    def _pool(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> ThreadedConnectionPool:
+        key = (args, tuple(sorted(kwargs.items())))
+        evicted = []
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is not None:
+                self._pools.move_to_end(key)
+                return pool
+        # Connexions initiales (pool_min) ouvertes hors du verrou
+        pool = _LruPool(self.config.pool_min, self.config.pool_max, *args, **kwargs)
+        with self._pools_lock:
+            existing = self._pools.get(key)
+            if existing is not None:
+                self._pools.move_to_end(key)
+                evicted.append(pool)
+                pool = existing
+            else:
+                self._pools[key] = pool
+                while len(self._pools) > max(PG_POOL_CACHE_SIZE, 1):
+                    evicted.append(self._pools.popitem(last=False)[1])
+        # Les connexions encore empruntées sont fermées à leur retour
+        for old in evicted:
+            old.retire()
+        return pool
+
+    @classmethod
+    def close_pools(cls) -> None:
+        """Ferme toutes les connexions des pools (arrêt du process)."""
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        for pool in pools:
+            pool.retire()
+
+    def _fetch(self, conn, code: str, params: Any, streamable: bool) -> Tuple[list, list]:
+        # Curseur serveur quand c'est possible : les lignes arrivent par
+        # FETCH de fetch_size au lieu d'être toutes rapatriées par libpq,
+        # et on s'arrête à max_rows sans lire le reste.
+        cursor = conn.cursor(name=f"bench_{uuid.uuid4().hex}") if streamable else conn.cursor()
+        with cursor as cur:
+            rows: list[tuple[Any, ...]] = []
+            if streamable:
+                cur.itersize = self.config.fetch_size
+                cur.execute(code, params)
+                rows = list(itertools.islice(cur, self.config.max_rows))
+            else:
+                cur.execute(code, params)
+                if cur.description:
+                    rows = cur.fetchmany(self.config.max_rows)
+            # Curseur nommé : description connue après le premier FETCH
+            cols: list[str] = [d.name for d in cur.description] if cur.description else []
+        return rows, cols
+
+    def _fetch_copy(self, conn, code: str, params: Any) -> Optional[Tuple[list, list]]:
+        """None si la requête ne passe pas par COPY : l'appelant se rabat sur _fetch."""
+        buf = io.StringIO()
+        with conn.cursor() as cur:
+            query = code.strip().rstrip(";")
+            if params:
+                query = cur.mogrify(query, params).decode()
+            # Savepoint : un échec de COPY ne fait pas avorter la transaction
+            cur.execute("SAVEPOINT bench_copy")
+            try:
+                cur.copy_expert(
+                    f"COPY (SELECT * FROM ({query}) AS _q LIMIT {int(self.config.max_rows)}) "
+                    "TO STDOUT WITH (FORMAT csv, HEADER, NULL '\\N')",
+                    buf,
+                )
+            except psycopg2.Error:
+                cur.execute("ROLLBACK TO SAVEPOINT bench_copy")
+                return None
+        buf.seek(0)
+        reader = csv.reader(buf)
+        cols = next(reader, [])
+        rows = [tuple(None if v == "\\N" else v for v in r) for r in reader]
+        return rows, cols
+
+    def execute(self, code: str, db_id: str, context: Dict[str, Any]) -> ExecutionResult:
+        t0 = time.perf_counter()
 
         params = context.get("params", None)
         search_path = context.get("search_path", None)
 
+        connect_args = self._connect_args(context, db_id)
+        if connect_args is None:
+            return ExecutionResult(
+                success=False,
+                output=None,
+                captured_state={"db_id": db_id},
+                execution_time_ms=0.0,
+                memory_peak_mb=0.0,
+                error="Missing postgres connection info in context (dsn|dsn_base|host+user)",
+            )
+
         conn = None
+        pool: ThreadedConnectionPool | None = None
+        reusable = True
         try:
-            if dsn:
-                conn = psycopg2.connect(dsn, dbname=db_id)
-            elif dsn_base:
-                conn = psycopg2.connect(dsn_base + f" dbname={db_id}")
-            elif host and user:
-                conn = psycopg2.connect(
-                    host=host,
-                    port=port or 5432,
-                    user=user,
-                    password=password,
-                    dbname=db_id,
-                )
-            else:
-                return ExecutionResult(
-                    success=False,
-                    output=None,
-                    captured_state={"db_id": db_id},
-                    execution_time_ms=0.0,
-                    memory_peak_mb=0.0,
-                    error="Missing postgres connection info in context (dsn|dsn_base|host+user)",
-                )
+            pool = self._pool(*connect_args)
+            try:
+                conn = pool.getconn()
+            except PoolError:
+                # Pool plein : connexion dédiée, fermée après usage
+                pool = None
+                conn = psycopg2.connect(*connect_args[0], **connect_args[1])
 
             conn.autocommit = False
 
@@ -70,24 +228,14 @@ class PostgresExecutor(ExecutorPort):
                 if self.config.set_statement_timeout:
                     cur.execute("SET LOCAL statement_timeout = %s;", (self.config.timeout_ms,))
 
-                cur.execute(code, params)
-
-                rows: list[tuple[Any, ...]] = []
-                cols: list[str] = []
-                if cur.description:
-                    cols = [d.name for d in cur.description]
-
-                    fetched = 0
-                    while True:
-                        batch = cur.fetchmany(200)
-                        if not batch:
-                            break
-                        rows.extend(batch)
-                        fetched += len(batch)
-                        if fetched >= self.config.max_rows:
-                            break
+            streamable = _is_streamable(code)
+            fetched = self._fetch_copy(conn, code, params) if streamable and self.config.use_copy else None
+            if fetched is not None:
+                rows, cols = fetched
+            else:
+                rows, cols = self._fetch(conn, code, params, streamable)
 
-                conn.rollback()
+            conn.rollback()
 
             elapsed_ms = (time.perf_counter() - t0) * 1000.0
             return ExecutionResult(
@@ -104,7 +252,8 @@ class PostgresExecutor(ExecutorPort):
                 if conn:
                     conn.rollback()
             except Exception:
-                pass
+                # Connexion dans un état inconnu : on ne la rend pas au pool
+                reusable = False
 
             elapsed_ms = (time.perf_counter() - t0) * 1000.0
             return ExecutionResult(
@@ -117,7 +266,10 @@ class PostgresExecutor(ExecutorPort):
             )
         finally:
             try:
-                if conn:
+                if conn and pool is not None:
+                    # Transaction déjà annulée (rollback) : la connexion revient propre
+                    pool.putconn(conn, close=not reusable or conn.closed != 0)
+                elif conn:
                     conn.close()
             except Exception:
                 pass
@@ -1,7 +1,9 @@
 from __future__ import annotations
+import contextlib
 import time
 import traceback
 import tracemalloc
+import types
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
@@ -10,14 +12,29 @@ import polars as pl
 from domain.ports.executor import ExecutorPort, ExecutionResult
 from infrastructure.executor.dataset.dataset_locator import DatasetLocator
 from infrastructure.executor.dataset.parquet_loader import load_parquet_tables, ParquetLoadConfig
+from infrastructure.executor.hard_timeout import hard_timeout
+from infrastructure.executor.memory_sampler import RssWindow, rss_sampler
+from infrastructure.executor.snippet import compile_snippet
+
+def _traced_peak_mb() -> float:
+    _, peak = tracemalloc.get_traced_memory()
+    return float(peak) / (1024.0 * 1024.0)
 
 @dataclass(frozen=True)
 class PythonExecutorConfig:
     timeout_ms: int = 3000
-    capture_all_locals: bool = True
+    # Par défaut seuls result/output sont capturés ; True : toutes les variables du snippet
+    capture_all_locals: bool = False
     capture_keys: Optional[list[str]] = None
     forbid_imports: bool = False
     parquet_eager: bool = True
+    # Pic mémoire : par défaut, croissance du RSS du process échantillonnée par le
+    # thread partagé (memory_sampling). tracemalloc (memory_profiling) est exact
+    # mais taxe chaque allocation : opt-in, prioritaire s'il est activé
+    memory_profiling: bool = False
+    memory_sampling: bool = True
+    # timeout_ms imposé par SIGALRM pendant l'exécution (thread principal POSIX)
+    hard_timeout: bool = False
 
 class PythonExecutor(ExecutorPort):
     def __init__(self, locator: DatasetLocator, config: PythonExecutorConfig | None = None):
@@ -26,7 +43,11 @@ class PythonExecutor(ExecutorPort):
 
     def execute(self, code: str, db_id: str, context: Dict[str, Any]) -> ExecutionResult:
         t0 = time.perf_counter()
-        tracemalloc.start()
+        window: RssWindow | None = None
+        if self.config.memory_profiling:
+            tracemalloc.start()
+        elif self.config.memory_sampling:
+            window = rss_sampler.start()
 
         globals_dict: Dict[str, Any] = {"__builtins__": __builtins__}
         if self.config.forbid_imports:
@@ -34,74 +55,101 @@ class PythonExecutor(ExecutorPort):
             b["__import__"] = lambda *args, **kwargs: (_ for _ in ()).throw(RuntimeError("Imports are disabled."))
             globals_dict["__builtins__"] = b
 
-        locals_dict: Dict[str, Any] = dict(context)
-        locals_dict["db_id"] = db_id
-        locals_dict["pl"] = pl
-
         parquet_dir = self.locator.parquet_dir(db_id)
         tables = load_parquet_tables(parquet_dir, ParquetLoadConfig(eager=self.config.parquet_eager))
-        locals_dict.update(tables)
-        locals_dict["tables"] = tables
+        # Dict simple et non ChainMap : exec() résout chaque nom via les locals,
+        # une ChainMap y ajoute un __getitem__ Python. Construit en une seule
+        # expression (fusion des dicts en C).
+        locals_dict: Dict[str, Any] = {**(context or {}), "db_id": db_id, "pl": pl, **tables, "tables": tables}
 
         try:
-            compiled = compile(code, "<python_executor>", "exec")
+            compiled, is_expr = compile_snippet(code, "<python_executor>")
 
             def _guard() -> None:
                 if (time.perf_counter() - t0) * 1000.0 > self.config.timeout_ms:
                     raise TimeoutError(f"Execution timed out after {self.config.timeout_ms} ms")
 
             _guard()
-            exec(compiled, globals_dict, locals_dict)
+            with self._deadline(t0):
+                if is_expr:
+                    locals_dict["result"] = eval(compiled, globals_dict, locals_dict)
+                else:
+                    exec(compiled, globals_dict, locals_dict)
             _guard()
 
             output = locals_dict.get("result", locals_dict.get("output", None))
 
-            cur, peak = tracemalloc.get_traced_memory()
-            peak_mb = float(peak) / (1024.0 * 1024.0)
+            peak_mb = self._peak_mb(window)
             elapsed_ms = (time.perf_counter() - t0) * 1000.0
 
             return ExecutionResult(
                 success=True,
                 output=output,
-                captured_state=self._capture_state(locals_dict),
+                captured_state=self._capture_state(locals_dict, context, tables),
                 execution_time_ms=elapsed_ms,
                 memory_peak_mb=peak_mb,
                 error=None,
             )
 
         except Exception as e:
-            cur, peak = tracemalloc.get_traced_memory()
-            peak_mb = float(peak) / (1024.0 * 1024.0)
+            peak_mb = self._peak_mb(window)
             elapsed_ms = (time.perf_counter() - t0) * 1000.0
 
             return ExecutionResult(
                 success=False,
                 output=None,
-                captured_state=self._capture_state(locals_dict),
+                captured_state=self._capture_state(locals_dict, context, tables),
                 execution_time_ms=elapsed_ms,
                 memory_peak_mb=peak_mb,
                 error=f"{type(e).__name__}: {e}\n{traceback.format_exc()}",
             )
         finally:
-            tracemalloc.stop()
-
-    def _capture_state(self, locals_dict: Dict[str, Any]) -> Dict[str, Any]:
+            if self.config.memory_profiling:
+                tracemalloc.stop()
+            elif window is not None:
+                rss_sampler.stop(window)
+
+    def _deadline(self, t0: float):
+        if not self.config.hard_timeout:
+            return contextlib.nullcontext(False)
+        return hard_timeout(
+            self.config.timeout_ms / 1000.0 - (time.perf_counter() - t0),
+            f"Execution timed out after {self.config.timeout_ms} ms",
+        )
+
+    def _peak_mb(self, window: RssWindow | None) -> float:
+        if self.config.memory_profiling:
+            return _traced_peak_mb()
+        if window is not None:
+            return rss_sampler.stop(window)
+        return 0.0
+
+    def _capture_state(
+        self, locals_dict: Dict[str, Any], context: Dict[str, Any], tables: Dict[str, Any]
+    ) -> Dict[str, Any]:
         if self.config.capture_keys is not None:
             return {k: locals_dict.get(k) for k in self.config.capture_keys if k in locals_dict}
         if not self.config.capture_all_locals:
-            return {}
+            return {k: self._state_value(locals_dict[k]) for k in ("result", "output") if k in locals_dict}
 
+        # Seuls les noms introduits par le snippet sont inspectés (pas le contexte ni les tables injectées)
+        injected = {"pl", "db_id", "tables"}
+        injected.update(context or ())
+        injected.update(tables)
         state: Dict[str, Any] = {}
         for k, v in locals_dict.items():
-            if k.startswith("__") or k in ("pl",):
+            if k in injected or k.startswith("__"):
                 continue
-            if callable(v) or hasattr(v, "__spec__"):
+            if callable(v) or isinstance(v, types.ModuleType):
                 continue
-            if isinstance(v, (pl.DataFrame, pl.LazyFrame)):
-                try:
-                    state[k] = {"__type__": "DataFrame", "shape": v.shape, "columns": v.columns}
-                except Exception:
-                    state[k] = {"__type__": type(v).__name__}
-                continue
-            state[k] = v
+            state[k] = self._state_value(v)
         return state
+
+    @staticmethod
+    def _state_value(v: Any) -> Any:
+        if isinstance(v, (pl.DataFrame, pl.LazyFrame)):
+            try:
+                return {"__type__": "DataFrame", "shape": v.shape, "columns": v.columns}
+            except Exception:
+                return {"__type__": type(v).__name__}
+        return v
@@ -23,8 +23,8 @@ class SqliteExecutor(ExecutorPort):
         sqlite_path = self.locator.sqlite_path(db_id)
 
         try:
+            # row_factory par défaut : les lignes sont déjà des tuples
             conn = sqlite3.connect(f"file:{sqlite_path}?mode=ro", uri=True, check_same_thread=False)
-            conn.row_factory = sqlite3.Row
 
             deadline = time.perf_counter() + self.config.timeout_ms / 1000.0
 
@@ -36,20 +36,13 @@ class SqliteExecutor(ExecutorPort):
             cur = conn.cursor()
             cur.execute(code)
 
-            rows: list[tuple[Any, ...]] = []
             cols: list[str] = []
             if cur.description:
                 cols = [d[0] for d in cur.description]
 
-            fetched = 0
-            while True:
-                batch = cur.fetchmany(200)
-                if not batch:
-                    break
-                rows.extend(tuple(r) for r in batch)
-                fetched += len(batch)
-                if fetched >= self.config.max_rows:
-                    break
+            # Un seul fetchmany : la boucle est faite en C, et SQLite n'avance
+            # pas la requête au-delà de max_rows lignes
+            rows: list[tuple[Any, ...]] = cur.fetchmany(self.config.max_rows)
 
             elapsed_ms = (time.perf_counter() - t0) * 1000.0
             return ExecutionResult(
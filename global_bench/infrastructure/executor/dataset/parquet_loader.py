@@ -1,13 +1,34 @@
 from __future__ import annotations
 import os
+import stat
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Any, Iterable
+from typing import Dict, Any, List, Optional, Tuple
 
 import polars as pl
 
 @dataclass(frozen=True)
 class ParquetLoadConfig:
     eager: bool = True  # True => DataFrame, False => LazyFrame
+    load_concurrency: int = 4  # fichiers lus en parallèle (Polars relâche le GIL)
+    # Lecture eager : fichier mappé en mémoire et chunks des row groups gardés
+    # tels quels (pas de rechunk, donc pas de recopie contiguë des colonnes)
+    memory_map: bool = True
+    # Ne valide le cache que par le mtime du dossier (un seul stat par appel) :
+    # un fichier réécrit sur place sans changement du dossier n'est pas détecté
+    dir_mtime_only: bool = os.getenv("PARQUET_DIR_MTIME_ONLY", "0") == "1"
+
+# Tables déjà chargées, par (dossier, eager) : les exécutions suivantes sur le
+# même db_id ne relisent ni ne décodent les fichiers parquet (LRU).
+# Chaque entrée est datée par le mtime du dossier et par (nom, mtime, taille)
+# de chaque fichier ; dir_mtime_only réduit la vérification au seul dossier.
+PARQUET_CACHE_SIZE = int(os.getenv("PARQUET_CACHE_SIZE", "32"))
+_Manifest = List[Tuple[str, str]]
+_Stamp = Tuple[int, Optional[Tuple[Tuple[str, int, int], ...]]]
+_tables_cache: "OrderedDict[Tuple[str, bool], Tuple[_Stamp, Dict[str, Any]]]" = OrderedDict()
+_tables_lock = threading.Lock()
 
 def _table_name_from_path(p: str) -> str:
     base = os.path.basename(p)
@@ -15,20 +36,74 @@ def _table_name_from_path(p: str) -> str:
         base = base[:-8]
     return base
 
-def load_parquet_tables(parquet_dir: str, cfg: ParquetLoadConfig) -> Dict[str, Any]:
-    if not os.path.isdir(parquet_dir):
+def _scan_manifest(parquet_dir: str) -> _Manifest:
+    # DirEntry.is_file() s'appuie sur le type renvoyé par readdir : pas de stat par fichier
+    with os.scandir(parquet_dir) as it:
+        entries = [e for e in it if e.is_file() and e.name.lower().endswith(".parquet")]
+    entries.sort(key=lambda e: e.name)
+    return [(_table_name_from_path(e.name), e.path) for e in entries]
+
+def _files_stamp(parquet_dir: str) -> Tuple[Tuple[str, int, int], ...]:
+    with os.scandir(parquet_dir) as it:
+        stamp = [
+            (e.name, st.st_mtime_ns, st.st_size)
+            for e in it
+            if e.is_file() and e.name.lower().endswith(".parquet")
+            for st in (e.stat(),)
+        ]
+    stamp.sort()
+    return tuple(stamp)
+
+def _read_table(path: str, cfg: ParquetLoadConfig) -> Any:
+    if cfg.eager:
+        return pl.read_parquet(path, memory_map=cfg.memory_map, rechunk=False)
+    return pl.scan_parquet(path)
+
+def _read_tables(manifest: _Manifest, cfg: ParquetLoadConfig) -> Dict[str, Any]:
+    workers = min(cfg.load_concurrency, len(manifest))
+    if workers <= 1:
+        return {table: _read_table(path, cfg) for table, path in manifest}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parquet-load") as pool:
+        frames = pool.map(lambda entry: _read_table(entry[1], cfg), manifest)
+        return {table: frame for (table, _), frame in zip(manifest, frames)}
+
+def parquet_dir_mtime_ns(parquet_dir: str) -> int:
+    """Estampille du dataset (mtime du dossier), clé d'invalidation des caches."""
+    try:
+        st = os.stat(parquet_dir)
+    except FileNotFoundError:
+        st = None
+    if st is None or not stat.S_ISDIR(st.st_mode):
         raise FileNotFoundError(f"Parquet dataset dir not found: {parquet_dir}")
+    return st.st_mtime_ns
+
+def _isolated(tables: Dict[str, Any]) -> Dict[str, Any]:
+    # Nouveau dict (clés ajoutables/retirables) et DataFrame clonés : clone() est
+    # O(1) et partage les buffers, mais insert_column/drop_in_place/extend sur
+    # la copie ne modifient plus le DataFrame du cache. Les LazyFrame sont immuables.
+    return {name: t.clone() if isinstance(t, pl.DataFrame) else t for name, t in tables.items()}
 
-    out: Dict[str, Any] = {}
-    for name in sorted(os.listdir(parquet_dir)):
-        if not name.lower().endswith(".parquet"):
-            continue
-        path = os.path.join(parquet_dir, name)
-        table = _table_name_from_path(path)
+def parquet_dataset_stamp(parquet_dir: str, dir_mtime_only: bool = False) -> _Stamp:
+    """Estampille d'invalidation des caches : mtime du dossier + (nom, mtime, taille) par fichier."""
+    return (
+        parquet_dir_mtime_ns(parquet_dir),
+        None if dir_mtime_only else _files_stamp(parquet_dir),
+    )
+
+def load_parquet_tables(parquet_dir: str, cfg: ParquetLoadConfig) -> Dict[str, Any]:
+    stamp = parquet_dataset_stamp(parquet_dir, cfg.dir_mtime_only)
 
-        if cfg.eager:
-            out[table] = pl.read_parquet(path)
-        else:
-            out[table] = pl.scan_parquet(path)
+    key = (parquet_dir, cfg.eager)
+    with _tables_lock:
+        cached = _tables_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            _tables_cache.move_to_end(key)
+            return _isolated(cached[1])
 
-    return out
+    tables = _read_tables(_scan_manifest(parquet_dir), cfg)
+    with _tables_lock:
+        _tables_cache[key] = (stamp, tables)
+        _tables_cache.move_to_end(key)
+        while len(_tables_cache) > PARQUET_CACHE_SIZE:
+            _tables_cache.popitem(last=False)
+    return _isolated(tables)
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import os
 from typing import Literal
 
 from infrastructure.executor.dataset.dataset_locator import DatasetLocator
@@ -13,7 +14,10 @@ def make_executor(kind: ExecutorKind, locator: DatasetLocator):
     if kind == "python":
         return PythonExecutor(locator, PythonExecutorConfig())
     if kind == "polars":
-        return PolarsExecutor(locator, PolarsExecutorConfig())
+        # Tables injectées en LazyFrame ; moteur du collect() final surchargeable (streaming, in-memory, auto)
+        return PolarsExecutor(
+            locator, PolarsExecutorConfig(collect_engine=os.getenv("POLARS_COLLECT_ENGINE", "streaming"))
+        )
     if kind == "sqlite":
         return SqliteExecutor(locator, SqliteExecutorConfig())
     if kind == "postgres":
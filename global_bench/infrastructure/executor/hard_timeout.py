@@ -0,0 +1,44 @@
+from __future__ import annotations
+import contextlib
+import logging
+import signal
+import threading
+from typing import Iterator
+
+# Coupure franche d'un snippet : SIGALRM lève TimeoutError au milieu de
+# l'exécution, là où _guard() ne vérifie qu'avant et après exec().
+# POSIX et thread principal uniquement (restriction de signal) ; ailleurs, no-op.
+# Un appel natif (collect Polars) n'est interrompu qu'au retour en Python.
+
+logger = logging.getLogger(__name__)
+# Avertissement émis une seule fois : chaque exécution hors thread principal le déclencherait
+_unavailable_warned = False
+
+def hard_timeout_available() -> bool:
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+@contextlib.contextmanager
+def hard_timeout(seconds: float, message: str = "Execution timed out") -> Iterator[bool]:
+    """Yield True si le minuteur est armé, False si la plateforme/le thread ne le permet pas."""
+    if not hard_timeout_available():
+        global _unavailable_warned
+        if not _unavailable_warned:
+            _unavailable_warned = True
+            logger.warning(
+                "hard_timeout requested but SIGALRM cannot be armed in thread %r "
+                "(POSIX main thread only): only the soft timeout applies",
+                threading.current_thread().name,
+            )
+        yield False
+        return
+
+    def _on_alarm(signum, frame) -> None:
+        raise TimeoutError(message)
+
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, max(seconds, 0.001))
+    try:
+        yield True
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Set
+
+# Un seul thread échantillonne le RSS du process pour toutes les exécutions
+# en cours, au lieu d'un hook tracemalloc sur chaque allocation.
+SAMPLING_INTERVAL_S = 0.05
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        # Hors Linux : pas de mesure
+        return 0
+
+class RssWindow:
+    __slots__ = ("baseline", "peak")
+
+    def __init__(self, rss: int):
+        self.baseline = rss
+        self.peak = rss
+
+    @property
+    def peak_mb(self) -> float:
+        # Croissance du RSS pendant la fenêtre (le process entier, exécutions concurrentes comprises)
+        return float(max(0, self.peak - self.baseline)) / (1024.0 * 1024.0)
+
+class RssSampler:
+    def __init__(self, interval_s: float = SAMPLING_INTERVAL_S):
+        self.interval_s = interval_s
+        self._windows: Set[RssWindow] = set()
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> RssWindow:
+        window = RssWindow(_rss_bytes())
+        with self._lock:
+            self._windows.add(window)
+            self._active.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+                self._thread.start()
+        return window
+
+    def stop(self, window: RssWindow) -> float:
+        """Ferme la fenêtre (idempotent) et retourne son pic en Mo."""
+        rss = _rss_bytes()
+        with self._lock:
+            if window in self._windows:
+                self._windows.discard(window)
+                window.peak = max(window.peak, rss)
+            if not self._windows:
+                self._active.clear()
+        return window.peak_mb
+
+    def _run(self) -> None:
+        while True:
+            # Au repos tant qu'aucune exécution n'est mesurée
+            self._active.wait()
+            rss = _rss_bytes()
+            with self._lock:
+                for window in self._windows:
+                    if rss > window.peak:
+                        window.peak = rss
+            time.sleep(self.interval_s)
+
+rss_sampler = RssSampler()
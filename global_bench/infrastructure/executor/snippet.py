@@ -0,0 +1,21 @@
+from __future__ import annotations
+import ast
+import functools
+from typing import Any, Tuple
+
+# Objets code immuables : un même snippet (retries, plusieurs db_id) n'est
+# compilé qu'une fois, pour tous les backends Python/Polars du process.
+@functools.lru_cache(maxsize=512)
+def compile_snippet(code: str, filename: str = "<snippet>") -> Tuple[Any, bool]:
+    """(code, is_expr) : un snippet réduit à `result = <expr>` est compilé en expression pour eval()."""
+    tree = ast.parse(code, filename)
+    body = tree.body
+    if (
+        len(body) == 1
+        and isinstance(body[0], ast.Assign)
+        and len(body[0].targets) == 1
+        and isinstance(body[0].targets[0], ast.Name)
+        and body[0].targets[0].id == "result"
+    ):
+        return compile(ast.Expression(body[0].value), filename, "eval"), True
+    return compile(tree, filename, "exec"), False
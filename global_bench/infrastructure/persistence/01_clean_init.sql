@@ -97,6 +97,10 @@ CREATE TABLE IF NOT EXISTS task_results (
 );
 
 -- Index pour accélérer les recherches fréquentes (Leaderboards et Historiques)
-CREATE INDEX idx_evaluations_team ON evaluations(team_id);
-CREATE INDEX idx_task_results_eval ON task_results(evaluation_id);
+-- INCLUDE (id) : la jointure teams -> evaluations -> task_results du leaderboard
+-- reste en index-only scan
+CREATE INDEX idx_evaluations_team ON evaluations(team_id) INCLUDE (id);
+-- Reprise d'une session par son session_id public (worker de benchmark, websocket)
+CREATE INDEX idx_evaluations_session ON evaluations(session_id);
+CREATE INDEX idx_task_results_eval ON task_results(evaluation_id) INCLUDE (is_correct, silver_score);
 CREATE INDEX idx_questions_category ON questions(category);
\ No newline at end of file
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, List, Optional
 
 from sqlalchemy import (
@@ -22,6 +22,12 @@ class Base(DeclarativeBase):
     pass
 
 
+# created_at est TIMESTAMP WITH TIME ZONE dans 01_clean_init.sql : les colonnes
+# sont déclarées timezone=True pour stocker les datetimes UTC aware tels quels
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 # =========================
 # Association tables
 # =========================
@@ -72,7 +78,7 @@ class HackathonTable(Base):
     name: Mapped[str] = mapped_column(Text, nullable=False)
     start_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     end_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow)
 
 
 class ParticipantTable(Base):
@@ -83,6 +89,13 @@ class ParticipantTable(Base):
     first_name: Mapped[str] = mapped_column(Text, nullable=False)
     email: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
 
+    teams: Mapped[List["TeamTable"]] = relationship(
+        "TeamTable",
+        secondary=team_members,
+        back_populates="members",
+        lazy="select",
+    )
+
 
 class TeamTable(Base):
     __tablename__ = "teams"
@@ -95,12 +108,14 @@ class TeamTable(Base):
     )
     name: Mapped[str] = mapped_column(Text, nullable=False)
     api_key_hash: Mapped[Optional[str]] = mapped_column(Text, unique=True, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow)
 
+    # lazy="select" : charger explicitement avec selectinload() là où c'est utile
     members: Mapped[List[ParticipantTable]] = relationship(
         "ParticipantTable",
         secondary=team_members,
-        backref="teams",
+        back_populates="teams",
+        lazy="select",
     )
     evaluations: Mapped[List["EvaluationTable"]] = relationship(
         "EvaluationTable",
@@ -117,7 +132,7 @@ class DataContextTable(Base):
     schema_definition: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
     storage_link: Mapped[str] = mapped_column(String, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow)
 
 
 class QuestionTable(Base):
@@ -129,7 +144,7 @@ class QuestionTable(Base):
     language: Mapped[str] = mapped_column(String, nullable=False)
     category: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     difficulty: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow)
 
     contexts: Mapped[List[DataContextTable]] = relationship(
         "DataContextTable",
@@ -151,13 +166,14 @@ class EvaluationTable(Base):
     language: Mapped[str] = mapped_column(String, nullable=False)
     model_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     status: Mapped[str] = mapped_column(String, default="pending")
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow)
 
     results: Mapped[List["TaskResultTable"]] = relationship(
         "TaskResultTable",
         backref="evaluation",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        # chargé à la demande : selectinload() explicite là où on en a besoin
+        lazy="select",
     )
 
 
@@ -181,4 +197,4 @@ class TaskResultTable(Base):
     silver_score: Mapped[float] = mapped_column(Float, default=0.0)
     generation_duration: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     execution_metrics: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow)
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
-from typing import AsyncGenerator, Dict, Optional
+from typing import AsyncGenerator, Dict, List, Optional
 
-import asyncio
+import httpx
+import orjson
 import requests
 
 
@@ -14,50 +14,75 @@ class SseEvent:
     data: Dict
 
 
-def iter_sse_events(url: str, payload: Dict, timeout_s: int = 3600):
-    with requests.post(url, json=payload, stream=True, timeout=timeout_s) as r:
-        r.raise_for_status()
+class _SseParser:
+    """
+    Découpe le flux brut en événements : les octets reçus s'accumulent dans
+    un bytearray, chaque bloc terminé par une ligne vide est décodé d'un coup
+    (pas de découpage ni de décodage ligne par ligne).
+    """
 
-        event: Optional[str] = None
-        data_lines: list[str] = []
-
-        for raw in r.iter_lines(decode_unicode=True):
-            if raw is None:
-                continue
-            line = raw.strip()
-
-            if line == "":
-                if event and data_lines:
-                    data_str = "\n".join(data_lines)
-                    try:
-                        obj = json.loads(data_str)
-                    except Exception:
-                        obj = {"raw": data_str}
-                    yield SseEvent(event=event, data=obj)
-                event = None
-                data_lines = []
-                continue
+    def __init__(self):
+        self._buf = bytearray()
+
+    def feed(self, chunk: bytes) -> List[SseEvent]:
+        buf = self._buf
+        buf += chunk
+        if b"\r" in buf:
+            # Fins de ligne CRLF : normalisées sur tout le tampon (un \r\n peut chevaucher deux chunks)
+            buf[:] = buf.replace(b"\r\n", b"\n")
+        events: List[SseEvent] = []
+        start = 0
+        while True:
+            end = buf.find(b"\n\n", start)
+            if end < 0:
+                break
+            ev = self._parse_block(bytes(buf[start:end]))
+            if ev is not None:
+                events.append(ev)
+            start = end + 2
+        if start:
+            del buf[:start]
+        return events
 
+    @staticmethod
+    def _parse_block(block: bytes) -> Optional[SseEvent]:
+        event: Optional[str] = None
+        data_lines: List[str] = []
+        for line in block.decode("utf-8").splitlines():
+            line = line.strip()
             if line.startswith("event:"):
                 event = line[len("event:"):].strip()
             elif line.startswith("data:"):
                 data_lines.append(line[len("data:"):].strip())
+        if not event or not data_lines:
+            return None
+        data_str = "\n".join(data_lines)
+        try:
+            obj = orjson.loads(data_str)
+        except orjson.JSONDecodeError:
+            obj = {"raw": data_str}
+        return SseEvent(event=event, data=obj)
+
 
+def iter_sse_events(url: str, payload: Dict, timeout_s: int = 3600):
+    with requests.post(url, json=payload, stream=True, timeout=timeout_s) as r:
+        r.raise_for_status()
+        parser = _SseParser()
+        for chunk in r.iter_content(chunk_size=8192):
+            yield from parser.feed(chunk)
 
-async def aiter_sse_events(url: str, payload: Dict) -> AsyncGenerator[SseEvent, None]:
-    q: asyncio.Queue[Optional[SseEvent]] = asyncio.Queue()
 
-    def _producer():
-        try:
-            for ev in iter_sse_events(url, payload):
-                q.put_nowait(ev)
-        finally:
-            q.put_nowait(None)
-
-    await asyncio.to_thread(_producer)
-
-    while True:
-        ev = await q.get()
-        if ev is None:
-            break
-        yield ev
+async def aiter_sse_events(url: str, payload: Dict, timeout_s: int = 3600) -> AsyncGenerator[SseEvent, None]:
+    """
+    Les événements sont remis au fil de l'eau. Fermer (ou annuler) le
+    générateur ferme la connexion : le worker voit la déconnexion et arrête
+    de générer.
+    """
+    timeout = httpx.Timeout(timeout_s, connect=10.0)
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        async with client.stream("POST", url, json=payload) as r:
+            r.raise_for_status()
+            parser = _SseParser()
+            async for chunk in r.aiter_bytes():
+                for ev in parser.feed(chunk):
+                    yield ev
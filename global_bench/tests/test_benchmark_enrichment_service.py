@@ -0,0 +1,51 @@
+# tests/test_benchmark_enrichment_service.py
+from __future__ import annotations
+
+import pytest
+
+from domain.ports.executor import ExecutionResult
+from domain.services.benchmark_enrichment_service import BenchmarkEnrichmentService
+
+
+def _ok(rows) -> ExecutionResult:
+    return ExecutionResult(success=True, output=rows, captured_state={}, execution_time_ms=1.0, memory_peak_mb=0.0)
+
+
+def _score(pred_rows, gold_rows):
+    return BenchmarkEnrichmentService(exec_service=None)._score(_ok(pred_rows), _ok(gold_rows), 0.0)
+
+
+@pytest.mark.parametrize(
+    "pred, gold, expected",
+    [
+        ([(1, "a"), (2, "b")], [(2, "b"), (1, "a")], True),        # ordre des lignes ignoré
+        ([(1, "a"), (1, "a")], [(1, "a")], False),                 # doublons : multiset, pas ensemble
+        ([(1, "a"), (1, "a"), (2, "b")], [(1, "a"), (2, "b"), (2, "b")], False),
+        ([(1, "a"), (2, "b"), (1, "a")], [(1, "a"), (1, "a"), (2, "b")], True),
+        ([(1,), (2,)], [(1,), (2,), (3,)], False),                 # nombres de lignes différents
+        ([], [], True),
+        ([(None,)], [("NULL",)], True),                            # comparaison en texte : None -> "NULL"
+        ([(None, 1)], [(None, 2)], False),
+        ([(1, 2.0)], [("1", "2.0")], True),
+        ([("a\x1fb",)], [("a", "b")], False),                      # pas de collision de séparateurs
+        ([("a", "b\x1e"), ("c",)], [("a",), ("b\x1ec",)], False),
+    ],
+)
+def test_score_compares_row_multisets_as_text(pred, gold, expected):
+    result = _score(pred, gold)
+
+    assert result.is_correct is expected
+    assert (result.rows_pred, result.rows_gold) == (len(pred), len(gold))
+    assert result.match_kind == "sorted_string_rows"
+
+
+def test_failed_execution_is_not_scored():
+    failed = ExecutionResult(
+        success=False, output=None, captured_state={}, execution_time_ms=1.0, memory_peak_mb=0.0, error="boom"
+    )
+
+    result = BenchmarkEnrichmentService(exec_service=None)._score(failed, _ok([(1,)]), 0.0)
+
+    assert result.is_correct is None
+    assert result.match_kind == "exec_failed"
+    assert result.pred_error == "boom"
@@ -0,0 +1,41 @@
+# tests/test_dataset_service.py
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from domain.services.dataset_service import DatasetService
+
+# Types attendus : ceux de str(pandas.read_csv(path).dtypes[col])
+@pytest.mark.parametrize(
+    "rows, expected",
+    [
+        (["1", "2", "3"], "int64"),
+        (["1", "", "3"], "float64"),
+        (["1.5", "2", "3"], "float64"),
+        (["1.5", "NA", "3"], "float64"),
+        (["True", "False", "True"], "bool"),
+        (["True", "", "False"], "object"),
+        (["a", "2", "3"], "object"),
+        (["a", "", "c"], "object"),
+        (["", "", ""], "float64"),
+    ],
+)
+def test_csv_column_types_match_pandas(tmp_path: Path, rows, expected):
+    path = tmp_path / "t.csv"
+    path.write_text("id,col\n" + "".join(f"{i},{v}\n" for i, v in enumerate(rows)))
+
+    schema = DatasetService(repository=None)._extract_csv_schema(str(path))
+
+    assert schema["table_name"] == "t"
+    assert schema["columns"] == [{"name": "id", "type": "int64"}, {"name": "col", "type": expected}]
+
+
+def test_header_only_csv_is_object(tmp_path: Path):
+    path = tmp_path / "empty.csv"
+    path.write_text("a,b\n")
+
+    schema = DatasetService(repository=None)._extract_csv_schema(str(path))
+
+    assert schema["columns"] == [{"name": "a", "type": "object"}, {"name": "b", "type": "object"}]
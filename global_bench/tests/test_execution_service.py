@@ -60,7 +60,7 @@ def test_execution_service_polars_reads_tables_and_returns_df(datasets_root: Pat
     svc = ExecutionService(datasets_root=str(datasets_root))
 
     code = """
-# tables injected by executor: customers, orders (polars DataFrames)
+# tables injected by executor: customers, orders (polars LazyFrames, collected by the executor)
 result = (
     orders.join(customers, on="customer_id")
     .group_by("customer_id")
@@ -101,6 +101,27 @@ result = orders.shape[0] + customers.shape[0]
     assert resp.result.output == 4 + 3  # 4 orders + 3 customers
 
 
+def test_execution_service_python_runs_do_not_share_table_mutations(datasets_root: Path) -> None:
+    db_id = "shop_3"
+    _write_parquet_dataset(datasets_root, db_id)
+
+    svc = ExecutionService(datasets_root=str(datasets_root))
+
+    mutate = """
+customers.insert_column(0, pl.Series("extra", [0, 0, 0]))
+customers.drop_in_place("name")
+result = customers.columns
+"""
+    first = svc.execute(executor_kind="python", db_id=db_id, code=mutate, context={})
+    assert first.result.success is True
+    assert first.result.output == ["extra", "customer_id"]
+
+    # Les tables venant du cache : la run suivante doit voir les données d'origine
+    second = svc.execute(executor_kind="python", db_id=db_id, code="result = customers.columns", context={})
+    assert second.result.success is True
+    assert second.result.output == ["customer_id", "name"]
+
+
 def test_execution_service_sqlite_executes_query_and_returns_rows(datasets_root: Path) -> None:
     db_id = "shop_sqlite"
     _write_sqlite_dataset(datasets_root, db_id)
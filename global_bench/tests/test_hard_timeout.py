@@ -0,0 +1,50 @@
+# tests/test_hard_timeout.py
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from infrastructure.executor import hard_timeout as hard_timeout_module
+from infrastructure.executor.backends.python_executor import PythonExecutor, PythonExecutorConfig
+from infrastructure.executor.dataset.dataset_locator import DatasetLocator
+from infrastructure.executor.hard_timeout import hard_timeout, hard_timeout_available
+
+pytestmark = pytest.mark.skipif(not hard_timeout_available(), reason="SIGALRM needs the POSIX main thread")
+
+
+def test_long_snippet_is_interrupted_on_the_main_thread(tmp_path: Path):
+    (tmp_path / "db").mkdir()
+    pl.DataFrame({"x": [1]}).write_parquet(tmp_path / "db" / "t.parquet")
+    executor = PythonExecutor(
+        DatasetLocator(str(tmp_path)),
+        PythonExecutorConfig(timeout_ms=200, hard_timeout=True),
+    )
+
+    t0 = time.perf_counter()
+    res = executor.execute("while True:\n    pass", "db", {})
+
+    assert not res.success
+    assert res.error.startswith("TimeoutError")
+    assert time.perf_counter() - t0 < 5
+
+
+def test_unavailable_timer_logs_a_warning(monkeypatch, caplog):
+    monkeypatch.setattr(hard_timeout_module, "_unavailable_warned", False)
+    armed: list[bool] = []
+
+    def _worker() -> None:
+        with hard_timeout(0.1) as ok:
+            armed.append(ok)
+
+    with caplog.at_level(logging.WARNING, logger=hard_timeout_module.__name__):
+        thread = threading.Thread(target=_worker)
+        thread.start()
+        thread.join()
+
+    assert armed == [False]
+    assert "cannot be armed" in caplog.text
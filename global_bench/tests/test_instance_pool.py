@@ -0,0 +1,42 @@
+# tests/test_instance_pool.py
+from __future__ import annotations
+
+import pytest
+
+from domain.services.instance_pool import InstancePool
+
+
+class _FakeCloud:
+    def __init__(self):
+        self.provisioned = 0
+        self.terminated: list[str] = []
+        self.down: set[str] = set()
+
+    async def provision_instance(self):
+        self.provisioned += 1
+        pod_id = f"pod-{self.provisioned}"
+        return {"pod_id": pod_id, "url": f"http://{pod_id}"}
+
+    async def is_healthy(self, worker_url: str) -> bool:
+        return worker_url not in self.down
+
+    def terminate_instance(self, pod_id: str):
+        self.terminated.append(pod_id)
+
+
+@pytest.mark.asyncio
+async def test_idle_instance_is_reused_only_when_healthy():
+    cloud = _FakeCloud()
+    pool = InstancePool(cloud, max_size=2)
+
+    async with pool.acquire() as first:
+        pass
+    async with pool.acquire() as reused:
+        assert reused is first
+
+    cloud.down.add(first["url"])
+    async with pool.acquire() as replaced:
+        assert replaced["pod_id"] == "pod-2"
+
+    assert cloud.terminated == ["pod-1"]
+    await pool.close()
@@ -0,0 +1,51 @@
+# tests/test_memory_sampler.py
+from __future__ import annotations
+
+import time
+
+from infrastructure.executor import memory_sampler
+from infrastructure.executor.memory_sampler import RssSampler
+
+MB = 1024 * 1024
+
+
+def _wait_for(predicate, timeout: float = 1.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_window_reports_sampled_peak_growth(monkeypatch):
+    rss = {"value": 100 * MB}
+    monkeypatch.setattr(memory_sampler, "_rss_bytes", lambda: rss["value"])
+    sampler = RssSampler(interval_s=0.001)
+
+    window = sampler.start()
+    # Pic transitoire entre start et stop : seul le thread d'échantillonnage le voit
+    rss["value"] = 130 * MB
+    assert _wait_for(lambda: window.peak == 130 * MB)
+    rss["value"] = 110 * MB
+
+    assert sampler.stop(window) == 30.0
+    # Fenêtre fermée : plus mise à jour, stop idempotent
+    rss["value"] = 200 * MB
+    time.sleep(0.01)
+    assert sampler.stop(window) == 30.0
+
+
+def test_concurrent_windows_keep_their_own_baseline(monkeypatch):
+    rss = {"value": 100 * MB}
+    monkeypatch.setattr(memory_sampler, "_rss_bytes", lambda: rss["value"])
+    sampler = RssSampler(interval_s=0.001)
+
+    first = sampler.start()
+    rss["value"] = 120 * MB
+    second = sampler.start()
+    rss["value"] = 125 * MB
+
+    assert sampler.stop(second) == 5.0
+    assert sampler.stop(first) == 25.0
+    assert not sampler._active.is_set()
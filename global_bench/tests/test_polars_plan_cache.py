@@ -0,0 +1,68 @@
+# tests/test_polars_plan_cache.py
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from infrastructure.executor.backends import polars_executor
+from infrastructure.executor.backends.polars_executor import PolarsExecutor, PolarsExecutorConfig
+from infrastructure.executor.dataset.dataset_locator import DatasetLocator
+
+SNIPPET = 'result = t.lazy().filter(pl.col("x") > threshold).select(pl.col("x").sum())'
+
+
+@pytest.fixture
+def executor(tmp_path: Path, monkeypatch):
+    (tmp_path / "db").mkdir()
+    pl.DataFrame({"x": [1, 2, 3, 4]}).write_parquet(tmp_path / "db" / "t.parquet")
+
+    loads: list[str] = []
+    real_load = polars_executor.load_parquet_tables
+
+    def _counting_load(parquet_dir, cfg):
+        loads.append(parquet_dir)
+        return real_load(parquet_dir, cfg)
+
+    monkeypatch.setattr(polars_executor, "load_parquet_tables", _counting_load)
+    ex = PolarsExecutor(DatasetLocator(str(tmp_path)), PolarsExecutorConfig(reuse_lazy_plan=True, parquet_eager=True))
+    ex.loads = loads
+    return ex
+
+
+def _sum(res) -> int:
+    assert res.success, res.error
+    return res.output["x"][0]
+
+
+def test_same_code_and_context_replays_the_plan(executor):
+    assert _sum(executor.execute(SNIPPET, "db", {"threshold": 2})) == 7
+    assert _sum(executor.execute(SNIPPET, "db", {"threshold": 2})) == 7
+    assert len(executor.loads) == 1
+
+
+def test_context_is_part_of_the_plan_key(executor):
+    assert _sum(executor.execute(SNIPPET, "db", {"threshold": 2})) == 7
+    assert _sum(executor.execute(SNIPPET, "db", {"threshold": 3})) == 4
+    assert len(executor.loads) == 2
+
+
+def test_unhashable_context_bypasses_the_cache(executor):
+    for _ in range(2):
+        assert _sum(executor.execute(SNIPPET, "db", {"threshold": 2, "extra": [1]})) == 7
+    assert len(executor.loads) == 2
+    assert not executor._plan_cache
+
+
+def test_file_rewritten_in_place_invalidates_the_plan(executor, tmp_path: Path):
+    assert _sum(executor.execute(SNIPPET, "db", {"threshold": 2})) == 7
+
+    db_dir = tmp_path / "db"
+    dir_mtime = os.stat(db_dir).st_mtime_ns
+    pl.DataFrame({"x": [1, 2, 3, 4, 10]}).write_parquet(db_dir / "t.parquet")
+    os.utime(db_dir, ns=(dir_mtime, dir_mtime))
+
+    assert _sum(executor.execute(SNIPPET, "db", {"threshold": 2})) == 17
+    assert len(executor.loads) == 2
@@ -0,0 +1,90 @@
+# tests/test_postgres_repository.py
+from __future__ import annotations
+
+import os
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.adapters.repository.postgres_repository import PostgresRepository
+from infrastructure.persistence.tables import (
+    Base,
+    HackathonTable,
+    ParticipantTable,
+    TeamTable,
+)
+
+
+pytestmark = pytest.mark.skipif(
+    os.getenv("TEST_DATABASE_URL") is None,
+    reason="Set TEST_DATABASE_URL='postgresql://...' (throwaway database) to run",
+)
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine(os.environ["TEST_DATABASE_URL"])
+    Base.metadata.create_all(engine)
+    s = sessionmaker(bind=engine)()
+    try:
+        yield s
+    finally:
+        s.close()
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+def _count_selects(session):
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(session.get_bind(), "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def test_get_teams_by_hackathon_has_no_n_plus_one(session) -> None:
+    hackathon_id = uuid.uuid4()
+    session.add(HackathonTable(id=hackathon_id, name="h", created_at=datetime.now(timezone.utc)))
+    for i in range(5):
+        team = TeamTable(id=uuid.uuid4(), name=f"team-{i}", hackathon_id=hackathon_id)
+        team.members = [
+            ParticipantTable(id=uuid.uuid4(), first_name="a", last_name=str(j), email=f"{i}-{j}@x.io")
+            for j in range(3)
+        ]
+        session.add(team)
+    session.commit()
+    session.expunge_all()
+
+    repo = PostgresRepository(session)
+    selects = _count_selects(session)
+
+    teams = repo.get_teams_by_hackathon(hackathon_id)
+
+    assert len(teams) == 5
+    assert all(len(t.members) == 3 for t in teams)
+    # teams + un seul IN (...) pour les membres, quel que soit le nombre d'équipes
+    assert len(selects) == 2
+
+
+def test_add_participants_to_team_ignores_duplicates(session) -> None:
+    hackathon_id, team_id = uuid.uuid4(), uuid.uuid4()
+    participant_ids = [uuid.uuid4() for _ in range(3)]
+    session.add(HackathonTable(id=hackathon_id, name="h", created_at=datetime.now(timezone.utc)))
+    session.add(TeamTable(id=team_id, name="team", hackathon_id=hackathon_id))
+    for i, pid in enumerate(participant_ids):
+        session.add(ParticipantTable(id=pid, first_name="a", last_name=str(i), email=f"{i}@x.io"))
+    session.commit()
+
+    repo = PostgresRepository(session)
+    repo.add_participant_to_team(team_id, participant_ids[0])
+    repo.add_participants_to_team(team_id, participant_ids + participant_ids[:1])
+    session.expunge_all()
+
+    team = repo.get_team_by_id(team_id)
+    assert sorted(m.id for m in team.members) == sorted(participant_ids)
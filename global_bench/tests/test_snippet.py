@@ -0,0 +1,42 @@
+# tests/test_snippet.py
+from __future__ import annotations
+
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from infrastructure.executor.backends.polars_executor import PolarsExecutor
+from infrastructure.executor.backends.python_executor import PythonExecutor
+from infrastructure.executor.dataset.dataset_locator import DatasetLocator
+from infrastructure.executor.snippet import compile_snippet
+
+EXPR = 'result = orders.filter(pl.col("customer_id") == 1).height'
+STATEMENTS = 'flt = orders.filter(pl.col("customer_id") == 1)\nresult = flt.height'
+
+
+def test_single_result_assignment_compiles_to_an_expression():
+    assert compile_snippet(EXPR)[1] is True
+    assert compile_snippet(STATEMENTS)[1] is False
+    assert compile_snippet("result: int = 1")[1] is False
+
+
+@pytest.mark.parametrize("executor_cls", [PythonExecutor, PolarsExecutor])
+def test_eval_and_exec_paths_give_the_same_result(tmp_path: Path, executor_cls):
+    (tmp_path / "shop").mkdir()
+    pl.DataFrame({"order_id": [10, 11, 12], "customer_id": [1, 1, 2]}).write_parquet(
+        tmp_path / "shop" / "orders.parquet"
+    )
+    executor = executor_cls(DatasetLocator(str(tmp_path)))
+    if executor_cls is PolarsExecutor:
+        # Tables en LazyFrame : le snippet travaille sur des frames collectées
+        expr, statements = (s.replace("orders.", "orders.collect().") for s in (EXPR, STATEMENTS))
+    else:
+        expr, statements = EXPR, STATEMENTS
+
+    via_eval = executor.execute(expr, "shop", {})
+    via_exec = executor.execute(statements, "shop", {})
+
+    assert via_eval.success and via_exec.success, (via_eval.error, via_exec.error)
+    assert via_eval.output == via_exec.output == 2
+    assert via_eval.captured_state == via_exec.captured_state
@@ -0,0 +1,45 @@
+# tests/test_sse_client.py
+from __future__ import annotations
+
+from infrastructure.sse.sse_client import _SseParser
+
+
+def _feed_bytewise(payload: bytes):
+    parser = _SseParser()
+    events = []
+    for i in range(len(payload)):
+        events.extend(parser.feed(payload[i:i + 1]))
+    return events
+
+
+def test_crlf_split_across_one_byte_chunks():
+    payload = b'event: progress\r\ndata: {"done": 1}\r\n\r\nevent: progress\r\ndata: {"done": 2}\r\n\r\n'
+
+    events = _feed_bytewise(payload)
+
+    assert [(e.event, e.data) for e in events] == [("progress", {"done": 1}), ("progress", {"done": 2})]
+
+
+def test_comment_blocks_are_skipped():
+    payload = b': keep-alive\n\n: another comment\n\nevent: done\n: inline comment\ndata: {"ok": true}\n\n'
+
+    events = _SseParser().feed(payload)
+
+    assert [(e.event, e.data) for e in events] == [("done", {"ok": True})]
+
+
+def test_multiline_data_is_joined_with_newlines():
+    parser = _SseParser()
+
+    events = parser.feed(b'event: row\ndata: {"a":\ndata:  1}\n\nevent: log\ndata: line one\ndata: line two\n\n')
+
+    assert [(e.event, e.data) for e in events] == [("row", {"a": 1}), ("log", {"raw": "line one\nline two"})]
+
+
+def test_incomplete_block_waits_for_the_blank_line():
+    parser = _SseParser()
+
+    assert parser.feed('event: msg\ndata: {"text": "é"}\n'.encode()[:-3]) == []
+    events = parser.feed('event: msg\ndata: {"text": "é"}\n'.encode()[-3:] + b"\n")
+
+    assert [(e.event, e.data) for e in events] == [("msg", {"text": "é"})]
@@ -0,0 +1,38 @@
+# tests/test_websocket_notifier.py
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from infrastructure.adapters.notifier.websocket_notifier import WebSocketNotifier
+
+
+class _SlowManager:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.sent: list[tuple[str, dict]] = []
+        self.broadcasting = asyncio.Event()
+
+    async def broadcast_to_session(self, session_id: str, message: dict):
+        self.broadcasting.set()
+        await asyncio.sleep(self.delay)
+        self.sent.append((session_id, message))
+
+
+@pytest.mark.asyncio
+async def test_event_published_during_slow_broadcast_is_delivered():
+    manager = _SlowManager(delay=0.05)
+    notifier = WebSocketNotifier(manager, flush_interval=0.01)
+
+    await notifier.publish_progress({"session_id": "s1", "status": "running"})
+    await asyncio.wait_for(manager.broadcasting.wait(), 1.0)
+
+    # Publié pendant le broadcast du premier lot : aucune nouvelle tâche de flush
+    await notifier.publish_progress({"session_id": "s1", "status": "completed"})
+
+    await asyncio.wait_for(notifier._flush_task, 1.0)
+
+    assert len(manager.sent) == 2
+    assert manager.sent[1][0] == "s1"
+    assert len(manager.sent[1][1]["events"]) == 1
@@ -6,16 +6,19 @@ from typing import AsyncGenerator, Optional
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.core.config import settings
 from app.domain.models import BenchJob
-from app.domain.sse import sse
+from app.domain.sse import sse_bytes
 from app.services.hf_resolver import parse_hf_input
 
 router = APIRouter()
 
 class BenchRequest(BaseModel):
+    # Requête immuable une fois validée (validation pydantic-core, v2)
+    model_config = ConfigDict(frozen=True)
+
     model: str = Field(..., description="HF repo id 'org/model' or https://huggingface.co/org/model")
     revision: Optional[str] = Field(None, description="HF revision (commit SHA recommended).")
     schema: str
@@ -57,14 +60,14 @@ async def bench_stream(req: BenchRequest, request: Request):
     jq.enqueue(job)
 
     async def stream() -> AsyncGenerator[bytes, None]:
-        yield sse("status", {"phase": "queued", "job_id": job.job_id, "queue_size": jq.queue.qsize()}).encode("utf-8")
+        yield sse_bytes("status", {"phase": "queued", "job_id": job.job_id, "queue_size": jq.queue.qsize()})
         try:
             while True:
                 if await request.is_disconnected():
                     break
                 msg = await job.events.get()
-                yield msg.encode("utf-8")
-                if msg.startswith("event: done"):
+                yield msg
+                if msg.startswith(b"event: done"):
                     break
         except asyncio.CancelledError:
             return
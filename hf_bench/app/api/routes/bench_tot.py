@@ -2,18 +2,19 @@ from __future__ import annotations
 
 import asyncio
 import time
-from typing import AsyncGenerator, Optional
+from contextlib import nullcontext
+from typing import AsyncGenerator, List, Optional
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.core.config import settings
 from app.core.db import get_conn
-from app.domain.sse import sse
+from app.domain.sse import sse_bytes, sse_status
 from app.services.hf_resolver import parse_hf_input
 from app.services.spider_service import SpiderService
-from app.domain.spider.models import SchemaTextOptions
+from app.domain.spider.models import SchemaTextOptions, SpiderQuestionWithSchema
 from app.services.model_store import ModelStore
 from app.services.gpu_runtime import GpuRuntime
 from app.domain.models import ModelSpec
@@ -21,8 +22,13 @@ from app.services.benchmark import BenchRunner
 
 router = APIRouter()
 
+_DONE_OK = sse_bytes("done", {"status": "ok"})
+
 
 class CompleteBenchmarkRequest(BaseModel):
+    # Requête immuable une fois validée (validation pydantic-core, v2)
+    model_config = ConfigDict(frozen=True)
+
     model: str = Field(..., description="HF repo id 'org/model' or https://huggingface.co/org/model")
     revision: Optional[str] = Field(None, description="HF revision (commit SHA recommended).")
 
@@ -38,6 +44,31 @@ class CompleteBenchmarkRequest(BaseModel):
     dtype: str = settings.dtype
 
 
+def _sqlite_conn(request: Request):
+    # Connexion partagée ouverte au startup ; à défaut, connexion éphémère
+    shared = getattr(request.app.state, "sqlite_conn", None)
+    return nullcontext(shared) if shared is not None else get_conn()
+
+
+def _load_items(request: Request, req: CompleteBenchmarkRequest) -> List[SpiderQuestionWithSchema]:
+    with _sqlite_conn(request) as conn:
+        spider = SpiderService(
+            conn=conn,
+            schema_options=SchemaTextOptions(
+                use_original_names=True,
+                include_types=False,
+                max_columns_per_table=60,
+                max_total_chars=settings.max_prompt_chars,
+            ),
+        )
+        return spider.list_questions_with_schema(
+            source_file=req.source_file,
+            db_id=req.db_id,
+            limit=req.limit,
+            offset=req.offset,
+        )
+
+
 def _get_store(request: Request) -> ModelStore:
     store = request.app.state.model_store
     if store is None:
@@ -73,40 +104,26 @@ async def complete_benchmark_stream(req: CompleteBenchmarkRequest, request: Requ
 
     async def stream() -> AsyncGenerator[bytes, None]:
         # --- phase: start
-        yield sse("status", {"phase": "started", "model_id": model_id, "revision": revision}).encode("utf-8")
+        yield sse_bytes("status", {"phase": "started", "model_id": model_id, "revision": revision})
 
         # --- ensure model on disk (thread)
-        yield sse("status", {"phase": "downloading_or_cache_check"}).encode("utf-8")
+        yield sse_status("downloading_or_cache_check")
         t0 = time.perf_counter()
         local_path = await asyncio.to_thread(store.ensure_on_nvme, model_id, revision)
-        yield sse("status", {"phase": "model_ready_on_nvme", "ms": (time.perf_counter() - t0) * 1000}).encode("utf-8")
+        yield sse_bytes("status", {"phase": "model_ready_on_nvme", "ms": (time.perf_counter() - t0) * 1000})
 
         # --- load to GPU (thread)
-        yield sse("status", {"phase": "loading_model_to_gpu"}).encode("utf-8")
+        yield sse_status("loading_model_to_gpu")
         t1 = time.perf_counter()
         await asyncio.to_thread(runtime.ensure_loaded, ModelSpec(model_id, revision, req.dtype), local_path)
-        yield sse("status", {"phase": "model_loaded", "ms": (time.perf_counter() - t1) * 1000, "gpu": runtime.gpu_stats()}).encode("utf-8")
+        yield sse_bytes("status", {"phase": "model_loaded", "ms": (time.perf_counter() - t1) * 1000, "gpu": runtime.gpu_stats()})
 
         # --- pull questions (sqlite)
-        yield sse("status", {"phase": "loading_questions"}).encode("utf-8")
-        with get_conn() as conn:
-            spider = SpiderService(
-                conn=conn,
-                schema_options=SchemaTextOptions(
-                    use_original_names=True,
-                    include_types=False,
-                    max_columns_per_table=60,
-                    max_total_chars=settings.max_prompt_chars,
-                ),
-            )
-            items = spider.list_questions_with_schema(
-                source_file=req.source_file,
-                db_id=req.db_id,
-                limit=req.limit,
-                offset=req.offset,
-            )
+        yield sse_status("loading_questions")
+        # Requêtes SQLite + rendu des schémas : hors de la boucle d'événements
+        items = await asyncio.to_thread(_load_items, request, req)
 
-        yield sse("status", {"phase": "running", "count": len(items)}).encode("utf-8")
+        yield sse_bytes("status", {"phase": "running", "count": len(items)})
 
         # --- warmup once (use first question)
         if items:
@@ -118,7 +135,7 @@ async def complete_benchmark_stream(req: CompleteBenchmarkRequest, request: Requ
                 schema=first.schema_text,
                 question=first.question.question,
             )
-            yield sse("status", {"phase": "warmup_done"}).encode("utf-8")
+            yield sse_status("warmup_done")
 
         # --- run questions sequentially (stream each result)
         for i, item in enumerate(items):
@@ -155,9 +172,9 @@ async def complete_benchmark_stream(req: CompleteBenchmarkRequest, request: Requ
                 "sql": res["sql"],
                 "gold_sql": q.gold_sql,
             }
-            yield sse("result", payload).encode("utf-8")
+            yield sse_bytes("result", payload)
 
-        yield sse("done", {"status": "ok"}).encode("utf-8")
+        yield _DONE_OK
 
     return StreamingResponse(
         stream(),
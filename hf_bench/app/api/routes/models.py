@@ -1,17 +1,24 @@
-from fastapi import APIRouter, Query
-from app.core.config import settings
+from fastapi import APIRouter, HTTPException, Query, Request
 from app.services.model_store import ModelStore
-from huggingface_hub import HfApi
 
 router = APIRouter(prefix="/worker")
 
-store = ModelStore(settings=settings, api=HfApi())
+
+def _get_store(request: Request) -> ModelStore:
+    # Store unique du process, créé au startup (main.create_app)
+    store = request.app.state.model_store
+    if store is None:
+        raise HTTPException(status_code=500, detail="Model store not initialized")
+    return store
+
 
 @router.get("/model_present")
 def model_present(
+    request: Request,
     model_id: str = Query(...),
     revision: str = Query("main"),
 ):
+    store = _get_store(request)
     return {
         "model_id": model_id,
         "revision": revision,
@@ -20,12 +27,12 @@ def model_present(
 
 
 @router.get("/models")
-def list_models():
+def list_models(request: Request):
     """
     Liste tous les modèles prêts (.READY) sur ce worker
     """
-    models = store.list_ready_models()
+    models = _get_store(request).list_ready_models()
     return {
         "count": len(models),
         "models": models,
-    }
\ No newline at end of file
+    }
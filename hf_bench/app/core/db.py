@@ -32,8 +32,7 @@ def _sqlite_path_from_url(db_url: str) -> Path:
     return p
 
 
-@contextmanager
-def get_conn() -> Iterator[sqlite3.Connection]:
+def _connect_ro() -> sqlite3.Connection:
     p = _sqlite_path_from_url(DB_URL)
     if not p.exists():
         raise FileNotFoundError(f"SQLite DB not found: {p}")
@@ -41,9 +40,30 @@ def get_conn() -> Iterator[sqlite3.Connection]:
     # Valid sqlite URI: file:///abs/path?mode=ro
     uri = p.as_uri() + "?mode=ro"
     conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    # Pas de PRAGMA foreign_keys : connexion en lecture seule, rien à contrôler
+    return conn
+
+
+def open_shared_conn() -> sqlite3.Connection:
+    """
+    Connexion lecture seule ouverte une fois au démarrage (app.state.sqlite_conn)
+    et partagée par les requêtes : cache de pages gardé chaud, fichier mappé en mémoire.
+    Le module sqlite3 sérialise les appels concurrents sur la connexion.
+    """
+    conn = _connect_ro()
+    conn.execute("PRAGMA query_only = 1;")
+    conn.execute("PRAGMA mmap_size = 1073741824;")
+    conn.execute("PRAGMA cache_size = -262144;")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+    return conn
+
+
+@contextmanager
+def get_conn() -> Iterator[sqlite3.Connection]:
+    # Connexion éphémère, pour les scripts (le service utilise open_shared_conn)
+    conn = _connect_ro()
     try:
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON;")
         yield conn
     finally:
         conn.close()
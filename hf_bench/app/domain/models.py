@@ -7,7 +7,7 @@ import asyncio
 
 DType = Literal["float16", "bfloat16", "float32"]
 
-@dataclass
+@dataclass(slots=True)
 class BenchJob:
     job_id: str
     model_id: str
@@ -20,9 +20,9 @@ class BenchJob:
     do_sample: bool
     dtype: DType
     created_at: float = field(default_factory=time.time)
-    events: asyncio.Queue[str] = field(default_factory=lambda: asyncio.Queue(maxsize=300))
+    events: asyncio.Queue[bytes] = field(default_factory=lambda: asyncio.Queue(maxsize=300))
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ModelSpec:
     model_id: str
     revision: str
@@ -1,10 +1,29 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+from dataclasses import dataclass, field
 from typing import Any, Optional
 
+try:
+    import orjson
 
-@dataclass(frozen=True)
+    _json_loads = orjson.loads
+except ImportError:  # orjson absent de l'image : json standard
+    _json_loads = json.loads
+
+
+def loads_json(v):
+    if v is None:
+        return None
+    if isinstance(v, (dict, list)):
+        return v
+    try:
+        return _json_loads(v)
+    except Exception:
+        return v
+
+
+@dataclass(frozen=True, slots=True)
 class SchemaTextOptions:
     use_original_names: bool = True
     include_types: bool = False
@@ -12,7 +31,7 @@ class SchemaTextOptions:
     max_total_chars: Optional[int] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SpiderQuestion:
     id: int
     db_id: str
@@ -20,10 +39,19 @@ class SpiderQuestion:
     gold_sql: Optional[str]
     source_file: str
     source_index: int
-    meta: dict[str, Any]
+    # Colonnes JSON brutes (sql_json, query_toks, ...) : décodées au premier accès à meta
+    raw_meta: dict[str, Any] = field(default_factory=dict, repr=False)
+    _meta: Optional[dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def meta(self) -> dict[str, Any]:
+        # slots : pas de __dict__ pour cached_property, le résultat est gardé dans _meta
+        if self._meta is None:
+            object.__setattr__(self, "_meta", {k: loads_json(v) for k, v in self.raw_meta.items()})
+        return self._meta
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SpiderQuestionWithSchema:
     question: SpiderQuestion
     schema_text: str
@@ -1,19 +1,19 @@
 from __future__ import annotations
 
-import json
+import sqlite3
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
 from app.domain.spider.models import SpiderQuestion
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TableRow:
     table_id: int
     name: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ForeignKeyRow:
     from_table_id: int
     from_col: str
@@ -62,12 +62,6 @@ class SpiderRepository:
 
         out: List[SpiderQuestion] = []
         for r in rows:
-            meta = {
-                "sql_json": _loads_json(r["sql_json"]),
-                "query_toks": _loads_json(r["query_toks"]),
-                "query_toks_no_value": _loads_json(r["query_toks_no_value"]),
-                "question_toks": _loads_json(r["question_toks"]),
-            }
             out.append(
                 SpiderQuestion(
                     id=int(r["id"]),
@@ -76,7 +70,7 @@ class SpiderRepository:
                     gold_sql=str(r["query"]) if r["query"] is not None else None,
                     source_file=str(r["source_file"]),
                     source_index=int(r["source_index"]),
-                    meta=meta,
+                    raw_meta=_raw_meta(r),
                 )
             )
         return out
@@ -94,12 +88,6 @@ class SpiderRepository:
         if r is None:
             return None
 
-        meta = {
-            "sql_json": _loads_json(r["sql_json"]),
-            "query_toks": _loads_json(r["query_toks"]),
-            "query_toks_no_value": _loads_json(r["query_toks_no_value"]),
-            "question_toks": _loads_json(r["question_toks"]),
-        }
         return SpiderQuestion(
             id=int(r["id"]),
             db_id=str(r["db_id"]),
@@ -107,9 +95,16 @@ class SpiderRepository:
             gold_sql=str(r["query"]) if r["query"] is not None else None,
             source_file=str(r["source_file"]),
             source_index=int(r["source_index"]),
-            meta=meta,
+            raw_meta=_raw_meta(r),
         )
 
+    def _tuples(self, sql: str, params) -> sqlite3.Cursor:
+        # Lignes en tuples (pas de sqlite3.Row) : dépaquetage positionnel, sans
+        # résolution des colonnes par nom à chaque accès
+        cur = self.conn.cursor()
+        cur.row_factory = None
+        return cur.execute(sql, params)
+
     def get_tables(self, db_id: str, *, use_original: bool) -> List[TableRow]:
         field = "name_original" if use_original else "name"
         sql = f"""
@@ -118,8 +113,7 @@ class SpiderRepository:
         WHERE db_id = ?
         ORDER BY table_id
         """
-        rows = self.conn.execute(sql, (db_id,)).fetchall()
-        return [TableRow(int(r["table_id"]), str(r["tname"])) for r in rows]
+        return [TableRow(table_id, tname) for table_id, tname in self._tuples(sql, (db_id,))]
 
     def get_columns_by_table(self, db_id: str, *, use_original: bool) -> Dict[int, List[Tuple[str, str]]]:
         field = "name_original" if use_original else "name"
@@ -129,11 +123,9 @@ class SpiderRepository:
         WHERE db_id = ? AND table_id IS NOT NULL
         ORDER BY table_id, column_id
         """
-        rows = self.conn.execute(sql, (db_id,)).fetchall()
         out: Dict[int, List[Tuple[str, str]]] = {}
-        for r in rows:
-            tid = int(r["table_id"])
-            out.setdefault(tid, []).append((str(r["cname"]), str(r["col_type"])))
+        for tid, cname, col_type in self._tuples(sql, (db_id,)):
+            out.setdefault(tid, []).append((cname, col_type))
         return out
 
     def get_primary_keys(self, db_id: str, *, use_original: bool) -> Dict[int, List[str]]:
@@ -146,10 +138,9 @@ class SpiderRepository:
         WHERE pk.db_id = ? AND c.table_id IS NOT NULL
         ORDER BY c.table_id, c.column_id
         """
-        rows = self.conn.execute(sql, (db_id,)).fetchall()
         out: Dict[int, List[str]] = {}
-        for r in rows:
-            out.setdefault(int(r["table_id"]), []).append(str(r["cname"]))
+        for tid, cname in self._tuples(sql, (db_id,)):
+            out.setdefault(tid, []).append(cname)
         return out
 
     def get_foreign_keys(self, db_id: str, *, use_original: bool) -> List[ForeignKeyRow]:
@@ -168,20 +159,89 @@ class SpiderRepository:
         WHERE fk.db_id = ?
           AND c_from.table_id IS NOT NULL
           AND c_to.table_id IS NOT NULL
+        ORDER BY fk.from_column_id, fk.to_column_id
+        """
+        return [ForeignKeyRow(*r) for r in self._tuples(sql, (db_id,))]
+
+
+    # Variantes groupées : une requête pour tous les db_id (IN (?,...)), résultats
+    # regroupés par db_id, dans le même ordre que les méthodes unitaires.
+
+    def get_tables_bulk(self, db_ids: List[str], *, use_original: bool) -> Dict[str, List[TableRow]]:
+        field = "name_original" if use_original else "name"
+        sql = f"""
+        SELECT db_id, table_id, {field} AS tname
+        FROM spider_tables
+        WHERE db_id IN ({_placeholders(db_ids)})
+        ORDER BY db_id, table_id
+        """
+        out: Dict[str, List[TableRow]] = {}
+        for db_id, table_id, tname in self._tuples(sql, db_ids):
+            out.setdefault(db_id, []).append(TableRow(table_id, tname))
+        return out
+
+    def get_columns_by_table_bulk(
+        self, db_ids: List[str], *, use_original: bool
+    ) -> Dict[str, Dict[int, List[Tuple[str, str]]]]:
+        field = "name_original" if use_original else "name"
+        sql = f"""
+        SELECT db_id, table_id, {field} AS cname, col_type
+        FROM spider_columns
+        WHERE db_id IN ({_placeholders(db_ids)}) AND table_id IS NOT NULL
+        ORDER BY db_id, table_id, column_id
+        """
+        out: Dict[str, Dict[int, List[Tuple[str, str]]]] = {}
+        for db_id, tid, cname, col_type in self._tuples(sql, db_ids):
+            out.setdefault(db_id, {}).setdefault(tid, []).append((cname, col_type))
+        return out
+
+    def get_primary_keys_bulk(self, db_ids: List[str], *, use_original: bool) -> Dict[str, Dict[int, List[str]]]:
+        field = "name_original" if use_original else "name"
+        sql = f"""
+        SELECT pk.db_id AS db_id, c.table_id AS table_id, c.{field} AS cname
+        FROM spider_primary_keys pk
+        JOIN spider_columns c
+          ON c.db_id = pk.db_id AND c.column_id = pk.column_id
+        WHERE pk.db_id IN ({_placeholders(db_ids)}) AND c.table_id IS NOT NULL
+        ORDER BY pk.db_id, c.table_id, c.column_id
+        """
+        out: Dict[str, Dict[int, List[str]]] = {}
+        for db_id, tid, cname in self._tuples(sql, db_ids):
+            out.setdefault(db_id, {}).setdefault(tid, []).append(cname)
+        return out
+
+    def get_foreign_keys_bulk(self, db_ids: List[str], *, use_original: bool) -> Dict[str, List[ForeignKeyRow]]:
+        field = "name_original" if use_original else "name"
+        sql = f"""
+        SELECT
+          fk.db_id AS db_id,
+          c_from.table_id AS from_table_id,
+          c_from.{field} AS from_col,
+          c_to.table_id AS to_table_id,
+          c_to.{field} AS to_col
+        FROM spider_foreign_keys fk
+        JOIN spider_columns c_from
+          ON c_from.db_id = fk.db_id AND c_from.column_id = fk.from_column_id
+        JOIN spider_columns c_to
+          ON c_to.db_id = fk.db_id AND c_to.column_id = fk.to_column_id
+        WHERE fk.db_id IN ({_placeholders(db_ids)})
+          AND c_from.table_id IS NOT NULL
+          AND c_to.table_id IS NOT NULL
+        ORDER BY fk.db_id, fk.from_column_id, fk.to_column_id
         """
-        rows = self.conn.execute(sql, (db_id,)).fetchall()
-        return [
-            ForeignKeyRow(int(r["from_table_id"]), str(r["from_col"]), int(r["to_table_id"]), str(r["to_col"]))
-            for r in rows
-        ]
-
-
-def _loads_json(v):
-    if v is None:
-        return None
-    if isinstance(v, (dict, list)):
-        return v
-    try:
-        return json.loads(v)
-    except Exception:
-        return v
+        out: Dict[str, List[ForeignKeyRow]] = {}
+        for db_id, *fk in self._tuples(sql, db_ids):
+            out.setdefault(db_id, []).append(ForeignKeyRow(*fk))
+        return out
+
+
+def _placeholders(values: List[Any]) -> str:
+    return ",".join("?" * len(values))
+
+
+_META_COLUMNS = ("sql_json", "query_toks", "query_toks_no_value", "question_toks")
+
+
+def _raw_meta(r) -> Dict[str, Any]:
+    # Décodage JSON différé : SpiderQuestion.meta le fait au premier accès
+    return {k: r[k] for k in _META_COLUMNS}
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import functools
 import json
 from typing import Any, Dict
 
-def sse(event: str, data: Dict[str, Any]) -> str:
-    print(f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n")
-    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+def sse_bytes(event: str, data: Dict[str, Any]) -> bytes:
+    # Sérialisé une seule fois et directement en bytes : le flux n'a plus rien à réencoder
+    return b"event: " + event.encode() + b"\ndata: " + json.dumps(data, ensure_ascii=False).encode("utf-8") + b"\n\n"
+
+
+@functools.lru_cache(maxsize=64)
+def sse_status(phase: str) -> bytes:
+    # Statuts sans champ variable : encodés une seule fois par processus
+    return sse_bytes("status", {"phase": phase})
@@ -7,6 +7,7 @@ from fastapi import FastAPI
 from huggingface_hub import HfApi
 
 from app.core.config import settings
+from app.core.db import open_shared_conn
 from app.api.routes import bench_router, health_router, bench_tot_router, models_router
 from app.services.model_store import ModelStore
 from app.services.gpu_runtime import GpuRuntime
@@ -33,6 +34,11 @@ def create_app() -> FastAPI:
         runner = BenchRunner(settings=settings)
         
         app.state.model_store = store
+        try:
+            app.state.sqlite_conn = open_shared_conn()
+        except FileNotFoundError:
+            # Base absente : les routes retombent sur get_conn() (et son erreur)
+            app.state.sqlite_conn = None
         app.state.gpu_runtime = runtime
         app.state.bench_runner = runner
 
@@ -42,6 +48,12 @@ def create_app() -> FastAPI:
 
         app.state.job_queue = jq
 
+    @app.on_event("shutdown")
+    async def shutdown():
+        conn = getattr(app.state, "sqlite_conn", None)
+        if conn is not None:
+            conn.close()
+
     return app
 
 app = create_app()
@@ -8,7 +8,7 @@ from typing import Awaitable, Callable
 from fastapi import HTTPException
 
 from app.domain.models import BenchJob, ModelSpec
-from app.domain.sse import sse
+from app.domain.sse import sse_bytes
 from app.core.config import Settings
 from app.services.model_store import ModelStore
 from app.services.gpu_runtime import GpuRuntime
@@ -23,7 +23,7 @@ class JobQueue:
     queue: asyncio.Queue[BenchJob]
 
     async def emit(self, job: BenchJob, event: str, payload: dict) -> None:
-        await job.events.put(sse(event, payload))
+        await job.events.put(sse_bytes(event, payload))
 
     async def start_worker(self) -> None:
         async def loop():
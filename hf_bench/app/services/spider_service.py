@@ -8,7 +8,7 @@ from app.domain.spider.models import (
     SpiderQuestion,
     SpiderQuestionWithSchema,
 )
-from app.domain.spider.repository import SpiderRepository
+from app.domain.spider.repository import ForeignKeyRow, SpiderRepository, TableRow
 
 
 class SpiderService:
@@ -27,7 +27,8 @@ class SpiderService:
             max_columns_per_table=60,
             max_total_chars=8000,
         )
-        self._schema_cache: Dict[str, str] = {}
+        # Texte de schéma rendu une fois par (db_id, options) pour la durée du service
+        self._schema_cache: Dict[Tuple[str, SchemaTextOptions], str] = {}
 
     def list_questions(
         self,
@@ -43,7 +44,7 @@ class SpiderService:
         return self.repo.get_question_by_id(question_id=question_id)
 
     def get_schema_text(self, *, db_id: str) -> str:
-        cached = self._schema_cache.get(db_id)
+        cached = self._schema_cache.get((db_id, self.schema_options))
         if cached is not None:
             return cached
 
@@ -56,6 +57,38 @@ class SpiderService:
         pks = self.repo.get_primary_keys(db_id, use_original=opt.use_original_names)
         fks = self.repo.get_foreign_keys(db_id, use_original=opt.use_original_names)
 
+        text = self._render_schema(db_id, tables, cols, pks, fks)
+        self._schema_cache[(db_id, self.schema_options)] = text
+        return text
+
+    def _prefetch_schemas(self, db_ids: List[str]) -> None:
+        """Schémas des db_id pas encore en cache, chargés en 4 requêtes au total."""
+        opt = self.schema_options
+        missing = sorted({d for d in db_ids if (d, opt) not in self._schema_cache})
+        if not missing:
+            return
+
+        use_original = opt.use_original_names
+        tables = self.repo.get_tables_bulk(missing, use_original=use_original)
+        cols = self.repo.get_columns_by_table_bulk(missing, use_original=use_original)
+        pks = self.repo.get_primary_keys_bulk(missing, use_original=use_original)
+        fks = self.repo.get_foreign_keys_bulk(missing, use_original=use_original)
+
+        # db_id inconnu : pas de tables, get_schema_text lèvera l'erreur habituelle
+        for db_id, db_tables in tables.items():
+            self._schema_cache[(db_id, opt)] = self._render_schema(
+                db_id, db_tables, cols.get(db_id, {}), pks.get(db_id, {}), fks.get(db_id, [])
+            )
+
+    def _render_schema(
+        self,
+        db_id: str,
+        tables: List[TableRow],
+        cols: Dict[int, List[Tuple[str, str]]],
+        pks: Dict[int, List[str]],
+        fks: List[ForeignKeyRow],
+    ) -> str:
+        opt = self.schema_options
         table_name = {t.table_id: t.name for t in tables}
 
         lines: List[str] = [
@@ -101,8 +134,6 @@ class SpiderService:
         text = "\n".join(lines)
         if opt.max_total_chars and len(text) > opt.max_total_chars:
             text = text[: opt.max_total_chars - 1] + "…"
-
-        self._schema_cache[db_id] = text
         return text
 
     def list_questions_with_schema(
@@ -114,6 +145,7 @@ class SpiderService:
         offset: int = 0,
     ) -> List[SpiderQuestionWithSchema]:
         qs = self.list_questions(source_file=source_file, db_id=db_id, limit=limit, offset=offset)
+        self._prefetch_schemas([q.db_id for q in qs])
         return [
             SpiderQuestionWithSchema(question=q, schema_text=self.get_schema_text(db_id=q.db_id))
             for q in qs